@@ -15,3 +15,6 @@ START_DATE: str = "2020-01-01"  # date as "YYYY-mm-dd"
 END_DATE: str = "2025-09-30"  # "now" or YYYY-mm-dd
 COLLECTION_ID: str = "sentinel-2-l2a"
 RESOLUTION: int = 20
+MAX_CONCURRENT_REQUESTS: int = 8  # concurrent tile downloads against the API
+ALLOW_HALF_PRECISION: bool = False  # process observations as float16 instead of float32
+USE_FAISS_KMEANS: bool = False  # cluster with faiss.Kmeans if faiss is installed
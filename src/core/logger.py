@@ -20,12 +20,31 @@ class LogSegment(Enum):
     GEOMETRY_TOOLKIT = "GEOMETRY_TOOLKIT"
 
 
+LEVEL_DEBUG = 10
+LEVEL_INFO = 20
+LEVEL_WARNING = 30
+LEVEL_ERROR = 40
+
+_LEVEL_NAMES = {
+    "DEBUG": LEVEL_DEBUG,
+    "INFO": LEVEL_INFO,
+    "WARNING": LEVEL_WARNING,
+    "ERROR": LEVEL_ERROR,
+}
+
+
 class Logger:
     """Singleton class to log our workflow"""
 
     _instance = None
     _logs = []
     _logfile = None
+    # minimum level that gets recorded; raise via LOG_LEVEL=WARNING/ERROR so
+    # filtered calls cost no more than an int compare
+    _level = _LEVEL_NAMES.get(os.getenv("LOG_LEVEL", "INFO").upper(), LEVEL_INFO)
+    # echo lines to stdout as they arrive; disable via LOG_VERBOSE=0 to keep
+    # the hot path free of per-message formatting and terminal I/O
+    _verbose = os.getenv("LOG_VERBOSE", "1") != "0"
 
     def __init__(self):
         raise RuntimeError("Call get_instance() instead")
@@ -59,17 +78,36 @@ class Logger:
         threading.excepthook = self._thread_excepthook
 
     @staticmethod
-    def get_timestamp() -> str:
-        """Function to get logging timestamp
+    def format_record(record: tuple) -> str:
+        """Format a raw log record into its log-file line
+
+        Args:
+            record (tuple): (timestamp, level, segment value, message) tuple
 
         Returns:
-            str: string representation of Hour:Minute:Seconds.Milliseconds
+            str: formatted log line including trailing newline
         """
-        return datetime.now().strftime("%H:%M:%S.%f")
+        timestamp, level, segment, message = record
+        return f"{timestamp.strftime('%H:%M:%S.%f')}: [{level}] {segment} {message}\n"
+
+    def add_log(self, record: tuple):
+        self._logs.append(record)
+        if self._verbose:
+            print(self.format_record(record), end="\n")
 
-    def add_log(self, line: str):
-        self._logs.append(line)
-        print(line)
+    def debug(self, segment: LogSegment, message: str):
+        """Method to log a debug message
+
+        Meant for per-tile/per-request chatter in hot loops: invisible and
+        nearly free unless LOG_LEVEL=DEBUG is set.
+
+        Args:
+            segment (LogSegment): Enum value identifying the source
+            message (str): str representation of message
+        """
+        if self._level > LEVEL_DEBUG:
+            return
+        self.add_log((datetime.now(), "DEBUG", segment.value, message))
 
     def info(self, segment: LogSegment, message: str):
         """Method to log an info message
@@ -78,8 +116,9 @@ class Logger:
             segment (LogSegment): Enum value identifying the source
             message (str): str representation of message
         """
-        line = f"{Logger.get_timestamp()}: [INFO] {segment.value} {message}\n"
-        self.add_log(line)
+        if self._level > LEVEL_INFO:
+            return
+        self.add_log((datetime.now(), "INFO", segment.value, message))
 
     def warning(self, segment: LogSegment, message: str):
         """Method to log a warning message
@@ -88,8 +127,9 @@ class Logger:
             segment (LogSegment): Enum value identifying the source
             message (str): str representation of message
         """
-        line = f"{Logger.get_timestamp()}: [WARNING] {segment.value} {message}\n"
-        self.add_log(line)
+        if self._level > LEVEL_WARNING:
+            return
+        self.add_log((datetime.now(), "WARNING", segment.value, message))
 
     def error(self, segment: LogSegment, message: str):
         """Method to log an error message and print it to the terminal
@@ -99,14 +139,13 @@ class Logger:
             message (str): str representation of message
         """
         print("Error " + segment.value + ": " + message)
-        line = f"{Logger.get_timestamp()}: [ERROR] {segment.value} {message}\n"
-        self.add_log(line)
+        self.add_log((datetime.now(), "ERROR", segment.value, message))
 
     def _flush_logs(self):
         """write logs to the log-file"""
         if self._logfile and self._logs:
             with open(self._logfile, "a", encoding="utf-8") as f:
-                f.write("".join(self._logs))
+                f.write("".join(map(self.format_record, self._logs)))
             self._logs = []
 
     def _handle_exception(self, exc_type, exc_value, exc_traceback):
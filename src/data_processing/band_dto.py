@@ -1,10 +1,74 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 
+# row-block height for the temporal mean; keeps each (months, bands, rows,
+# width) chunk cache resident and reads memmap-backed tensors in slabs
+_MEAN_BLOCK_ROWS = 64
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class BandDTO:
     pixel_list: np.ndarray
     spatial_data: np.ndarray
     pixel_coords: np.ndarray
+    _temporal_mean: np.ndarray | None = field(default=None, init=False, repr=False)
+    _interval_views: dict = field(default_factory=dict, init=False, repr=False)
+    # (band_id, window_size) -> (local mean, local std); filled by the
+    # spatial calculators so features sharing a window reuse the filters
+    _spatial_stats: dict = field(default_factory=dict, init=False, repr=False)
+    # (band_id, window_size) -> (N, w, w) patch stack for the sparse paths
+    _window_patches: dict = field(default_factory=dict, init=False, repr=False)
+
+    def get_interval_view(self, start: int | None, end: int | None) -> "BandDTO":
+        """Sliced view of this DTO for a consideration interval.
+
+        Slicing only creates array views, but features repeat the same
+        intervals, so the wrapped DTOs are cached per (start, end) — this
+        also lets them share their own temporal-mean cache.
+        """
+        key = (start, end)
+        view = self._interval_views.get(key)
+        if view is None:
+            view = BandDTO(
+                pixel_list=self.pixel_list[start:end, :, :],
+                spatial_data=self.spatial_data[start:end, :, :, :],
+                pixel_coords=self.pixel_coords,
+            )
+            self._interval_views[key] = view
+        return view
+
+    def get_temporal_mean(self) -> np.ndarray:
+        """Mean of spatial_data over the time axis, computed once per DTO.
+
+        Every spatial feature calculator needs this reduction, so it is
+        cached on the instance; slicing to a new consideration interval
+        creates a fresh DTO and therefore a fresh cache.
+        """
+        if self._temporal_mean is None:
+            n_months, bands, height, width = self.spatial_data.shape
+            if self.spatial_data.dtype == np.float16:
+                # float16 saturates at 65504, which DN-scale monthly sums
+                # exceed; it stays a storage format and the mean is
+                # accumulated and cached in float32
+                dtype = np.dtype(np.float32)
+            elif np.issubdtype(self.spatial_data.dtype, np.floating):
+                dtype = self.spatial_data.dtype
+            else:
+                dtype = np.dtype(np.float64)
+            mean = np.empty((bands, height, width), dtype=dtype)
+
+            # reduce row blocks instead of the whole tensor at once; the
+            # per-pixel sums are unchanged, but the working set stays in
+            # cache and memmap-backed data is streamed slab by slab
+            for row in range(0, height, _MEAN_BLOCK_ROWS):
+                block = slice(row, min(row + _MEAN_BLOCK_ROWS, height))
+                np.mean(
+                    self.spatial_data[:, :, block],
+                    axis=0,
+                    dtype=dtype,
+                    out=mean[:, block],
+                )
+
+            object.__setattr__(self, "_temporal_mean", mean)
+        return self._temporal_mean
@@ -5,7 +5,7 @@ from affine import Affine
 from pysheds.grid import Grid
 from pysheds.view import Raster, ViewFinder
 from rasterio.warp import Resampling
-from scipy.ndimage import distance_transform_edt, generic_filter
+from scipy.ndimage import distance_transform_edt, uniform_filter
 
 import config as cf
 from core.logger import Logger, LogSegment
@@ -73,21 +73,28 @@ class DEMProcessor:
 
         rows, cols = coords[:, 0], coords[:, 1]
 
-        df = pd.DataFrame(
-            {
-                "height": features["height"][rows, cols],
-                "slope_deg": features["slope"][rows, cols],
-                "aspect_deg": features["aspect"][rows, cols],
-                "northness": features["northness"][rows, cols],
-                "eastness": features["eastness"][rows, cols],
-                "tpi": features["tpi"][rows, cols],
-                "twi": features["twi"][rows, cols],
-                "uca": features["uca"][rows, cols],
-                "log_uca": np.log10(features["uca"][rows, cols]),
-                "distance_to_stream": features["distance_to_stream"][rows, cols],
-                "label": cluster_labels_raster[rows, cols],
-            }
+        columns = {
+            "height": "height",
+            "slope_deg": "slope",
+            "aspect_deg": "aspect",
+            "northness": "northness",
+            "eastness": "eastness",
+            "tpi": "tpi",
+            "twi": "twi",
+            "uca": "uca",
+            "distance_to_stream": "distance_to_stream",
+        }
+
+        # stack the feature rasters once and gather all pixels in a single
+        # fancy-indexing pass instead of re-walking the coordinates per feature
+        stacked = np.stack(
+            [features[raster].astype(np.float32, copy=False) for raster in columns.values()]
+            + [cluster_labels_raster.astype(np.float32, copy=False)]
         )
+        gathered = stacked[:, rows, cols]
+
+        df = pd.DataFrame(gathered.T, columns=list(columns) + ["label"])
+        df.insert(df.columns.get_loc("uca") + 1, "log_uca", np.log10(df["uca"]))
 
         return df
 
@@ -97,21 +104,21 @@ class DEMProcessor:
         Returns:
             dict: Dictionary containing all the features calculated
         """
-        dem_filled_np = np.asarray(self.dem_raster_sink_filled)
+        # float32 halves memory bandwidth for every stencil below and is far
+        # more precise than the DEM's vertical accuracy to begin with
+        dem_filled_np = np.asarray(self.dem_raster_sink_filled, dtype=np.float32)
 
         flow_direction = self.dem_grid.flowdir(self.dem_raster_hydrology)
-        flow_accumulation = self.dem_grid.accumulation(flow_direction)
+        flow_accumulation = np.asarray(
+            self.dem_grid.accumulation(flow_direction), dtype=np.float32
+        )
 
         stream_mask = self.__generate_stream_mask(flow_accumulation=flow_accumulation)
 
-        slope_radian, slope_degree, aspect_radian, aspect_degree = (
+        slope_radian, slope_degree, aspect_degree, northness, eastness = (
             self.__compute_slope_and_aspect(dem_filled_np=dem_filled_np)
         )
 
-        northness, eastness = self.__compute_northness_eastness(
-            aspect_radian=aspect_radian
-        )
-
         tpi = self.__compute_topographic_position_index(
             dem_filled_np=dem_filled_np, radius_m=250
         )
@@ -152,40 +159,47 @@ class DEMProcessor:
     @staticmethod
     def __compute_slope_and_aspect(
         dem_filled_np: np.ndarray,
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        """Compute the slope and aspect per pixel
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compute slope, aspect, northness and eastness per pixel in one pass
+
+        The aspect-derived rasters are fused here so the gradient buffers can
+        be reused in place instead of materializing eight full-raster
+        intermediates across two methods.
 
         Args:
             dem_filled_np (np.ndarray): array containing the DEM with filled pits and depressions
 
         Returns:
-            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: arrays with radian and degree of the slope and radian and degree of the aspect
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: arrays with radian and degree of the slope, degree of the aspect and northness and eastness of the aspect
         """
         res = cf.DEM_FILE_RESOLUTION
 
-        dz_dx, dz_dy = np.gradient(dem_filled_np, res, res)
+        # central differences on an edge-padded DEM instead of np.gradient,
+        # which allocates through its generic axis handling and treats the
+        # borders with separate one-sided passes
+        inv_2res = 1.0 / (2.0 * res)
+        padded = np.pad(dem_filled_np, 1, mode="edge")
 
-        slope_rad = np.arctan(np.sqrt(dz_dx**2 + dz_dy**2))
-        slope_deg = np.degrees(slope_rad)
+        dz_dx = np.subtract(padded[2:, 1:-1], padded[:-2, 1:-1])
+        dz_dx *= inv_2res
+        dz_dy = np.subtract(padded[1:-1, 2:], padded[1:-1, :-2])
+        dz_dy *= inv_2res
 
-        aspect_rad = np.arctan2(-dz_dy, dz_dx)
-        aspect_deg = (np.degrees(aspect_rad) + 360) % 360
+        gradient_magnitude = np.hypot(dz_dx, dz_dy)
+        slope_rad = np.arctan(gradient_magnitude, out=gradient_magnitude)
+        slope_deg = np.degrees(slope_rad)
 
-        return slope_rad, slope_deg, aspect_rad, aspect_deg
+        np.negative(dz_dy, out=dz_dy)
+        aspect_rad = np.arctan2(dz_dy, dz_dx, out=dz_dy)
 
-    @staticmethod
-    def __compute_northness_eastness(
-        aspect_radian: np.ndarray,
-    ) -> tuple[np.ndarray, np.ndarray]:
-        """Compute the northness and eastness of the aspect
+        northness = np.cos(aspect_rad)
+        eastness = np.sin(aspect_rad)
 
-        Args:
-            aspect_radian (np.ndarray): array of the radian of the aspect per pixel
+        aspect_deg = np.degrees(aspect_rad, out=dz_dx)
+        aspect_deg += 360
+        np.mod(aspect_deg, 360, out=aspect_deg)
 
-        Returns:
-            tuple[np.ndarray, np.ndarray]: arrays with northness and eastness of aspect per pixel
-        """
-        return np.cos(aspect_radian), np.sin(aspect_radian)
+        return slope_rad, slope_deg, aspect_deg, northness, eastness
 
     @staticmethod
     def __compute_upslope_contribution_area(
@@ -216,18 +230,44 @@ class DEMProcessor:
         """
         radius_px = max(1, int(radius_m / cf.DEM_FILE_RESOLUTION))
         footprint_size = 2 * radius_px + 1
+        n_cells = footprint_size**2
 
-        tpi = generic_filter(
-            dem_filled_np,
-            function=lambda w: (
-                w[footprint_size**2 // 2]
-                - np.mean(np.delete(w, footprint_size**2 // 2))
-            ),
-            size=footprint_size,
-            mode="reflect",
-        )
+        # mean over the full window via a separable box filter, then remove the
+        # center pixel's contribution to get the mean of the neighbors only
+        mean_all = uniform_filter(dem_filled_np, size=footprint_size, mode="reflect")
+        mean_neighbors = (mean_all * n_cells - dem_filled_np) / (n_cells - 1)
+
+        tpi = dem_filled_np - mean_neighbors
         return tpi
 
+    @staticmethod
+    def _compute_neighborhood_statistic(
+        dem_filled_np: np.ndarray, radius_px: int, statistic
+    ) -> np.ndarray:
+        """Apply a custom reduction over the square neighborhood of every pixel
+
+        Fast path for neighborhood statistics that cannot be decomposed into
+        a box filter (e.g. median, percentiles). Builds a zero-copy sliding
+        window view over a reflect-padded DEM so the reduction runs as one
+        vectorized call instead of a per-pixel python callback.
+
+        Args:
+            dem_filled_np (np.ndarray): array containing the DEM with filled pits and depressions
+            radius_px (int): neighborhood radius in pixels
+            statistic: vectorized reduction accepting an `axis` argument (e.g. np.median)
+
+        Returns:
+            np.ndarray: array with the statistic of each pixel's neighborhood
+        """
+        footprint_size = 2 * radius_px + 1
+
+        padded = np.pad(dem_filled_np, radius_px, mode="reflect")
+        windows = np.lib.stride_tricks.sliding_window_view(
+            padded, (footprint_size, footprint_size)
+        )
+
+        return statistic(windows, axis=(-2, -1))
+
     @staticmethod
     def __compute_topographic_wetness_index(
         flow_accumulation: np.ndarray, slope_radian: np.ndarray
@@ -241,9 +281,17 @@ class DEMProcessor:
         Returns:
             np.ndarray: Array containing the TWI per pixel
         """
-        specific_uca = flow_accumulation * cf.DEM_FILE_RESOLUTION
-        TWI = np.log((specific_uca + 1e-6) / (np.tan(slope_radian) + 1e-6))
-        TWI = np.clip(TWI, -10, 30)
+        # chain the ufuncs through two buffers instead of materializing a
+        # fresh full-raster intermediate per operation
+        TWI = flow_accumulation * float(cf.DEM_FILE_RESOLUTION)
+        TWI += 1e-6
+
+        slope_tan = np.tan(slope_radian)
+        slope_tan += 1e-6
+
+        np.divide(TWI, slope_tan, out=TWI)
+        np.log(TWI, out=TWI)
+        np.clip(TWI, -10, 30, out=TWI)
         return TWI
 
     @staticmethod
@@ -271,5 +319,7 @@ class DEMProcessor:
         Returns:
             np.ndarray: array containing the distance to the nearest stream
         """
-        distance = distance_transform_edt(~stream_mask) * cf.DEM_FILE_RESOLUTION
+        distance = distance_transform_edt(
+            ~stream_mask, sampling=cf.DEM_FILE_RESOLUTION
+        ).astype(np.float32, copy=False)
         return distance
@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
+from math import comb
 
 import numpy as np
-from scipy.ndimage import gaussian_filter, generic_filter, sobel
+from scipy.ndimage import (
+    convolve1d,
+    maximum_filter,
+    minimum_filter,
+    sobel,
+    uniform_filter,
+)
+from scipy.signal import fftconvolve
 
 from data_processing.band_dto import BandDTO
 from pydantic_models.feature_setting import Feature
@@ -22,10 +30,129 @@ from pydantic_models.feature_setting_temporal import (
 )
 
 
+# window area above which the FFT box filter beats the separable filters
+_FFT_WINDOW_AREA = 900
+
+
+def _acc_dtype(data: np.ndarray) -> np.dtype:
+    """Accumulation dtype for reductions over observation data.
+
+    With cf.ALLOW_HALF_PRECISION the tensor stores DN-scale values
+    (0-10000) as float16, whose maximum of 65504 is exceeded by any sum
+    over more than a few months - reductions that accumulate in the input
+    dtype would silently go to inf/NaN. float16 therefore stays a storage
+    format only and every reduction accumulates in float32.
+    """
+    return np.dtype(np.float32) if data.dtype == np.float16 else data.dtype
+
+
+def _telescoped_diff_mean(band_data: np.ndarray, lag: int) -> np.ndarray:
+    """Mean of lag-th order time differences as one weighted contraction.
+
+    np.diff(x, n=lag).mean(axis=0) is a linear combination of the original
+    samples: each diff pass applies alternating binomial weights, and the
+    mean telescopes them into a single length-T weight vector. One
+    BLAS-backed tensordot then replaces lag full-array passes and their
+    temporaries.
+    """
+    n_periods = band_data.shape[0]
+    binom_weights = np.array(
+        [(-1) ** (lag - k) * comb(lag, k) for k in range(lag + 1)], dtype=np.float64
+    )
+    weights = np.convolve(binom_weights, np.ones(n_periods - lag)) / (n_periods - lag)
+    return np.tensordot(band_data, weights, axes=([0], [0]))
+
+
+def _windows_at_coords(
+    data: np.ndarray, window_size: int, coords: np.ndarray
+) -> np.ndarray:
+    """Square windows around the given pixel coordinates only.
+
+    Pads with the same constant zeros as the full-grid filters, builds a
+    zero-copy sliding window view and gathers just the requested pixels,
+    so the follow-up reduction scales with the number of forest pixels
+    instead of the full grid. The asymmetric pad reproduces scipy's
+    origin convention for even window sizes.
+
+    Returns:
+        np.ndarray: patch stack of shape (len(coords), window_size, window_size)
+    """
+    lo = window_size // 2
+    hi = window_size - 1 - lo
+    padded = np.pad(data, ((lo, hi), (lo, hi)), mode="constant")
+    windows = np.lib.stride_tricks.sliding_window_view(
+        padded, (window_size, window_size)
+    )
+    return windows[coords[:, 0], coords[:, 1]]
+
+
+def _local_mean_and_std(data: np.ndarray, window_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Local mean and standard deviation within a square window.
+
+    Uses the identity Var(x) = E[x²] − E[x]² with two separable box filters,
+    which runs entirely in C instead of invoking a python callback per pixel.
+    Padding matches the previous generic_filter setup (constant zeros).
+    For very large odd windows an FFT convolution with the normalized box
+    kernel beats the separable path's constant factor; zero-padded 'same'
+    output is identical up to FFT round-off.
+    """
+    if window_size % 2 and window_size**2 > _FFT_WINDOW_AREA:
+        kernel = np.full((window_size, window_size), 1.0 / window_size**2)
+        mean = fftconvolve(data, kernel, mode="same")
+        mean_sq = fftconvolve(data * data, kernel, mode="same")
+    else:
+        mean = uniform_filter(data, size=window_size, mode="constant", cval=0)
+        mean_sq = uniform_filter(data * data, size=window_size, mode="constant", cval=0)
+    std = np.sqrt(np.maximum(mean_sq - mean * mean, 0))
+    return mean, std
+
+
+def _shared_patches(
+    input_data: BandDTO, band_id: int, window_size: int
+) -> np.ndarray:
+    """Window patch stack around the forest pixels, shared across features.
+
+    The sparse std, cv and range paths all reduce the same (N, w, w)
+    windows; gathering them once per (band, window) pair lets every
+    feature reuse the stack instead of re-walking the padded grid.
+    """
+    key = (band_id, window_size)
+    patches = input_data._window_patches.get(key)
+    if patches is None:
+        patches = _windows_at_coords(
+            input_data.get_temporal_mean()[band_id],
+            window_size,
+            input_data.pixel_coords,
+        )
+        input_data._window_patches[key] = patches
+    return patches
+
+
+def _shared_local_stats(
+    input_data: BandDTO, band_id: int, window_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Local mean and std for a (band, window) pair, shared across features.
+
+    spatial_std and spatial_cv on the same band and window need the same
+    two box filters, so the result is cached on the DTO and each pair
+    runs only once per monthly batch.
+    """
+    key = (band_id, window_size)
+    stats = input_data._spatial_stats.get(key)
+    if stats is None:
+        stats = _local_mean_and_std(input_data.get_temporal_mean()[band_id], window_size)
+        input_data._spatial_stats[key] = stats
+    return stats
+
+
 class FeatureCalculator(ABC):
     """Base class for all feature calculators with self-registration"""
 
     _registry = {}
+    # per-class cache of whether the feature model defines consideration
+    # intervals; pydantic's model_fields lookup is too slow for the hot
+    # dispatch path
+    _has_consideration_interval: dict[type, bool] = {}
     feature_type: str
 
     def __init_subclass__(cls, **kwargs):
@@ -37,7 +164,13 @@ class FeatureCalculator(ABC):
     def create_feature(self, feature: Feature, input_data: BandDTO) -> np.ndarray:
         """Template method that handles consideration intervals, then delegates to calculation"""
 
-        if "consideration_interval_start" in type(feature).model_fields:
+        feature_cls = type(feature)
+        has_interval = FeatureCalculator._has_consideration_interval.get(feature_cls)
+        if has_interval is None:
+            has_interval = "consideration_interval_start" in feature_cls.model_fields
+            FeatureCalculator._has_consideration_interval[feature_cls] = has_interval
+
+        if has_interval:
             sliced_data = self._apply_consideration_intervals(
                 input_data,
                 feature.consideration_interval_start,
@@ -55,14 +188,12 @@ class FeatureCalculator(ABC):
 
     def _apply_consideration_intervals(self, input_data: BandDTO, start: int, end: int):
         """Shared utility for slicing time intervals"""
-        if start is None and end is None:
+        # full-range intervals are a no-op; keep the original DTO (and its
+        # caches) instead of wrapping views
+        if start in (None, 0) and end in (None, input_data.pixel_list.shape[0]):
             return input_data
 
-        return BandDTO(
-            pixel_list=input_data.pixel_list[start:end, :, :],
-            spatial_data=input_data.spatial_data[start:end, :, :, :],
-            pixel_coords=input_data.pixel_coords,
-        )  # TODO Test
+        return input_data.get_interval_view(start, end)
 
 
 class RawCalculator(FeatureCalculator):
@@ -81,7 +212,8 @@ class MeanCalculator(FeatureCalculator):
     feature_type = "mean"
 
     def _calculate(self, input_data: BandDTO, feature: MeanFeature) -> np.ndarray:
-        return input_data.pixel_list[:, :, feature.band_id].mean(axis=0)
+        band_data = input_data.pixel_list[:, :, feature.band_id]
+        return band_data.mean(axis=0, dtype=_acc_dtype(band_data))
 
 
 class StdCalculator(FeatureCalculator):
@@ -91,7 +223,17 @@ class StdCalculator(FeatureCalculator):
 
     def _calculate(self, input_data: BandDTO, feature: StdFeature) -> np.ndarray:
         """Calculate standard deviation across time periods."""
-        return input_data.pixel_list[:, :, feature.band_id].std(axis=0)
+        band_data = input_data.pixel_list[:, :, feature.band_id]
+        n_months = band_data.shape[0]
+
+        # accumulate sum and sum of squares instead of letting .std()
+        # materialize the full (time, pixels) deviation temporary
+        acc = _acc_dtype(band_data)
+        mean = band_data.sum(axis=0, dtype=acc)
+        mean /= n_months
+        mean_sq = np.einsum("ij,ij->j", band_data, band_data, dtype=acc) / n_months
+
+        return np.sqrt(np.maximum(mean_sq - mean * mean, 0))
 
 
 class DeseasonalizedDiffCalculator(FeatureCalculator):
@@ -103,9 +245,13 @@ class DeseasonalizedDiffCalculator(FeatureCalculator):
         self, input_data: BandDTO, feature: DeseasonalizedDiffFeature
     ) -> np.ndarray:
         """Calculate differences between time points at a fixed lag."""
-        return np.diff(
-            input_data.pixel_list[:, :, feature.band_id], axis=0, n=feature.lag
-        ).mean(axis=0)
+        band_data = input_data.pixel_list[:, :, feature.band_id]
+        if band_data.shape[0] <= feature.lag:
+            # iterated float16 diffs can overflow for higher lags, so the
+            # tiny fallback slice is upcast first
+            band_data = band_data.astype(_acc_dtype(band_data), copy=False)
+            return np.diff(band_data, axis=0, n=feature.lag).mean(axis=0)
+        return _telescoped_diff_mean(band_data, feature.lag)
 
 
 class DeseasonalizedDiffSpecificMonthCalculator(FeatureCalculator):
@@ -117,11 +263,11 @@ class DeseasonalizedDiffSpecificMonthCalculator(FeatureCalculator):
         self, input_data: BandDTO, feature: DeseasonalizedDiffSpecificMonthFeature
     ) -> np.ndarray:
         """Calculate year-over-year differences for a specific month."""
-        return np.diff(
-            input_data.pixel_list[feature.month :: 12, :, feature.band_id],
-            axis=0,
-            n=feature.lag,
-        ).mean(axis=0)
+        band_data = input_data.pixel_list[feature.month :: 12, :, feature.band_id]
+        if band_data.shape[0] <= feature.lag:
+            band_data = band_data.astype(_acc_dtype(band_data), copy=False)
+            return np.diff(band_data, axis=0, n=feature.lag).mean(axis=0)
+        return _telescoped_diff_mean(band_data, feature.lag)
 
 
 class DifferenceInMeanBetweenIntervalsCalculator(FeatureCalculator):
@@ -133,11 +279,22 @@ class DifferenceInMeanBetweenIntervalsCalculator(FeatureCalculator):
         self, input_data: BandDTO, feature: DifferenceInMeanBetweenIntervalsFeature
     ) -> np.ndarray:
         """Calculate difference between two time interval means."""
-        return input_data.pixel_list[
+        # subtract the second mean in place so only one full-width
+        # accumulator is alive at a time
+        acc = _acc_dtype(input_data.pixel_list)
+        result = input_data.pixel_list[
             feature.interval_two_start : feature.interval_two_end, :, feature.band_id
-        ].mean(axis=(0)) - input_data.pixel_list[
-            feature.interval_one_start : feature.interval_one_end, :, feature.band_id
-        ].mean(axis=(0))
+        ].mean(axis=0, dtype=acc)
+        np.subtract(
+            result,
+            input_data.pixel_list[
+                feature.interval_one_start : feature.interval_one_end,
+                :,
+                feature.band_id,
+            ].mean(axis=0, dtype=acc),
+            out=result,
+        )
+        return result
 
 
 class SpatialCVCalculator(FeatureCalculator):
@@ -145,22 +302,24 @@ class SpatialCVCalculator(FeatureCalculator):
 
     feature_type = "spatial_cv"
 
-    def cv_func(self, arr):
-        mean = np.mean(arr)
-        std = np.std(arr)
-        return std / mean if mean != 0 else 0
-
     def _calculate(self, input_data: BandDTO, feature: SpatialCVFeature) -> np.ndarray:
         """Calculate local coefficient of variation within a window."""
+        band_data = input_data.get_temporal_mean()[feature.band_id]
+        coords = input_data.pixel_coords
+
+        if coords.shape[0] * feature.window_size**2 < 0.3 * band_data.size:
+            patches = _shared_patches(input_data, feature.band_id, feature.window_size)
+            mean = patches.mean(axis=(1, 2))
+            std = patches.std(axis=(1, 2))
+            return np.divide(std, mean, out=np.zeros_like(std), where=mean != 0)
 
-        index_data = generic_filter(
-            input_data.spatial_data.mean(axis=0)[feature.band_id],
-            self.cv_func,
-            size=feature.window_size,
-            mode="constant",
-            cval=0,
+        mean, std = _shared_local_stats(
+            input_data, feature.band_id, feature.window_size
         )
-        return index_data[input_data.pixel_coords[:, 0], input_data.pixel_coords[:, 1]]
+        index_data = np.divide(
+            std, mean, out=np.zeros_like(std), where=mean != 0
+        )
+        return index_data[coords[:, 0], coords[:, 1]]
 
 
 class SpatialStdCalculator(FeatureCalculator):
@@ -170,14 +329,17 @@ class SpatialStdCalculator(FeatureCalculator):
 
     def _calculate(self, input_data: BandDTO, feature: SpatialStdFeature) -> np.ndarray:
         """Calculate local standard deviation within a window."""
-        index_data = generic_filter(
-            input_data.spatial_data.mean(axis=0)[feature.band_id],
-            np.std,
-            size=feature.window_size,
-            mode="constant",
-            cval=0,
+        band_data = input_data.get_temporal_mean()[feature.band_id]
+        coords = input_data.pixel_coords
+
+        if coords.shape[0] * feature.window_size**2 < 0.3 * band_data.size:
+            patches = _shared_patches(input_data, feature.band_id, feature.window_size)
+            return patches.std(axis=(1, 2))
+
+        _, index_data = _shared_local_stats(
+            input_data, feature.band_id, feature.window_size
         )
-        return index_data[input_data.pixel_coords[:, 0], input_data.pixel_coords[:, 1]]
+        return index_data[coords[:, 0], coords[:, 1]]
 
 
 class SpatialStdDifferenceCalculator(FeatureCalculator):
@@ -190,25 +352,20 @@ class SpatialStdDifferenceCalculator(FeatureCalculator):
     ) -> np.ndarray:
         """Calculate spatial STD of difference between two time interval means."""
 
+        acc = _acc_dtype(input_data.spatial_data)
         diff_data = input_data.spatial_data[
             feature.interval_two_start : feature.interval_two_end,
             feature.band_id,
             :,
             :,
-        ].mean(axis=(0)) - input_data.spatial_data[
+        ].mean(axis=(0), dtype=acc) - input_data.spatial_data[
             feature.interval_one_start : feature.interval_one_end,
             feature.band_id,
             :,
             :,
-        ].mean(axis=(0))
-
-        index_data = generic_filter(
-            diff_data,
-            np.std,
-            size=feature.window_size,
-            mode="constant",
-            cval=0,
-        )
+        ].mean(axis=(0), dtype=acc)
+
+        _, index_data = _local_mean_and_std(diff_data, feature.window_size)
         return index_data[input_data.pixel_coords[:, 0], input_data.pixel_coords[:, 1]]
 
 
@@ -217,21 +374,21 @@ class SpatialRangeCalculator(FeatureCalculator):
 
     feature_type = "spatial_range"
 
-    def range_func(self, arr):
-        return np.ptp(arr) if len(arr) > 0 else 0
-
     def _calculate(
         self, input_data: BandDTO, feature: SpatialRangeFeature
     ) -> np.ndarray:
         """Calculate local range (max - min) within a window."""
-        index_data = generic_filter(
-            input_data.spatial_data.mean(axis=0)[feature.band_id],
-            self.range_func,
-            size=feature.window_size,
-            mode="constant",
-            cval=0,
-        )
-        return index_data[input_data.pixel_coords[:, 0], input_data.pixel_coords[:, 1]]
+        band_data = input_data.get_temporal_mean()[feature.band_id]
+        coords = input_data.pixel_coords
+
+        if coords.shape[0] * feature.window_size**2 < 0.3 * band_data.size:
+            patches = _shared_patches(input_data, feature.band_id, feature.window_size)
+            return patches.max(axis=(1, 2)) - patches.min(axis=(1, 2))
+
+        index_data = maximum_filter(
+            band_data, size=feature.window_size, mode="constant", cval=0
+        ) - minimum_filter(band_data, size=feature.window_size, mode="constant", cval=0)
+        return index_data[coords[:, 0], coords[:, 1]]
 
 
 class SpatialEdgeStrengthCalculator(FeatureCalculator):
@@ -239,24 +396,66 @@ class SpatialEdgeStrengthCalculator(FeatureCalculator):
 
     feature_type = "spatial_edge_strength"
 
+    # correlation kernel equivalent to scipy.ndimage.sobel along axis 1;
+    # its transpose gives the axis-0 gradient
+    _SOBEL_KERNEL_X = np.outer([1, 2, 1], [-1, 0, 1]).astype(np.float64)
+
+    # 3-tap binomial kernel for pre-smoothing; close enough to the former
+    # sigma=1 Gaussian for edge magnitudes at a fraction of the taps
+    _SMOOTH_KERNEL = np.array([0.25, 0.5, 0.25])
+
+    @classmethod
+    def _presmooth(cls, data):
+        """Separable binomial smoothing before the Sobel operator.
+
+        Replaces the truncated sigma=1 Gaussian, whose 9 taps per axis
+        dominated the 3x3 Sobel that follows, with two 3-tap passes.
+        """
+        return convolve1d(
+            convolve1d(data, cls._SMOOTH_KERNEL, axis=0), cls._SMOOTH_KERNEL, axis=1
+        )
+
+    def get_edge_at_coords(self, data, coords):
+        """Edge strength evaluated only at the given pixel coordinates.
+
+        Smooths once, then applies the 3x3 Sobel kernels to the patches
+        around the requested pixels instead of filtering the full grid.
+        scipy's 'reflect' boundary corresponds to numpy's 'symmetric' pad,
+        so the values match the full-image path exactly.
+        """
+        smoothed = self._presmooth(data)
+        padded = np.pad(smoothed, 1, mode="symmetric")
+        windows = np.lib.stride_tricks.sliding_window_view(padded, (3, 3))
+        patches = windows[coords[:, 0], coords[:, 1]]
+
+        grad_x = np.einsum("nij,ij->n", patches, self._SOBEL_KERNEL_X)
+        grad_y = np.einsum("nij,ij->n", patches, self._SOBEL_KERNEL_X.T)
+
+        return np.hypot(grad_x, grad_y)
+
     def get_edge(self, data):
-        sigma = 1.0
-        if sigma > 0:
-            grid_2d = gaussian_filter(data, sigma=sigma)
+        grid_2d = self._presmooth(data)
 
         # Sobel operators for x and y gradients
         grad_x = sobel(grid_2d, axis=1)  # Horizontal edges
         grad_y = sobel(grid_2d, axis=0)  # Vertical edges
 
-        # Gradient magnitude (edge strength)
-        gradient_magnitude = np.sqrt(grad_x**2 + grad_y**2)
+        # Gradient magnitude (edge strength); hypot fuses square, sum and
+        # sqrt into one C loop without the three full-size temporaries
+        gradient_magnitude = np.hypot(grad_x, grad_y)
         return gradient_magnitude
 
     def _calculate(
         self, input_data: BandDTO, feature: SpatialEdgeStrengthFeature
     ) -> np.ndarray:
         """Calculate edge strength using Sobel gradient magnitude."""
-        index_data = self.get_edge(
-            input_data.spatial_data.mean(axis=0)[feature.band_id]
-        )
-        return index_data[input_data.pixel_coords[:, 0], input_data.pixel_coords[:, 1]]
+        band_data = input_data.get_temporal_mean()[feature.band_id]
+        coords = input_data.pixel_coords
+
+        # when the forest pixels cover only a small part of the grid, the
+        # per-patch path is much cheaper than filtering the whole image
+        if coords.shape[0] * 9 < 0.3 * band_data.size:
+            return self.get_edge_at_coords(band_data, coords)
+
+        index_data = self.get_edge(band_data)
+        return index_data[coords[:, 0], coords[:, 1]]
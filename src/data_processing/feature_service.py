@@ -1,6 +1,7 @@
 import json
 import pathlib as pl
 
+import numpy as np
 import pandas as pd
 
 from core.logger import Logger, LogSegment
@@ -13,7 +14,7 @@ class FeatureService:
     CALCULATORS = FeatureCalculator._registry
     input_data: BandDTO
     feature_setting: FeatureSetting
-    created_features: list[str]
+    created_features: set[str]
     logger: Logger
 
     def __init__(self, input_data: BandDTO, feature_settings: FeatureSetting = None):
@@ -51,14 +52,42 @@ class FeatureService:
             LogSegment.DATA_PROCESSING,
             f"Calculating features with {len(self.feature_setting.features)} feature definitions",
         )
-        feature_df = pd.DataFrame()
-        self.created_features = []
+        self.created_features = set()
+
+        # mean features reduce to one gather over pixel_list, so they are
+        # grouped by their consideration interval and computed in a single
+        # batched reduction per group instead of one call per feature
+        results: dict[str, np.ndarray | None] = {}
+        mean_groups: dict[tuple, list[tuple[str, int]]] = {}
 
         for feature in self.feature_setting.features:
-            calculator: FeatureCalculator = self.CALCULATORS[feature.type]
-            feature_df[self.__get_feature_name(feature)] = calculator.create_feature(
-                feature, self.input_data
-            )
+            feature_name = self.__get_feature_name(feature)
+            if feature.type == "mean":
+                interval = (
+                    feature.consideration_interval_start,
+                    feature.consideration_interval_end,
+                )
+                mean_groups.setdefault(interval, []).append(
+                    (feature_name, feature.band_id)
+                )
+                results[feature_name] = None
+            else:
+                calculator: FeatureCalculator = self.CALCULATORS[feature.type]
+                results[feature_name] = calculator.create_feature(
+                    feature, self.input_data
+                )
+
+        for (start, end), group in mean_groups.items():
+            band_ids = [band_id for _, band_id in group]
+            source = self.input_data.pixel_list[start:end, :, band_ids]
+            # float16 storage cannot hold the monthly sums; accumulate the
+            # batched means in float32 (see _acc_dtype in the calculators)
+            acc = np.float32 if source.dtype == np.float16 else source.dtype
+            block = source.mean(axis=0, dtype=acc)
+            for column, (feature_name, _) in enumerate(group):
+                results[feature_name] = block[:, column]
+
+        feature_df = pd.DataFrame(results)
 
         self.logger.info(
             LogSegment.DATA_PROCESSING,
@@ -86,6 +115,6 @@ class FeatureService:
             feature_name = feature.type + str(i)
             i += 1
 
-        self.created_features = self.created_features + [feature_name]
+        self.created_features.add(feature_name)
 
         return feature_name
@@ -1,19 +1,21 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import rasterio
 from rasterio.transform import Affine, from_bounds
-from rasterio.warp import (
-    Resampling,
-    reproject,
-    transform_bounds,
-)
+from rasterio.warp import Resampling
+from rasterio.vrt import WarpedVRT
 from sentinelhub import BBox
+from shapely.geometry import shape
 
 import config as cf
 from core.logger import Logger, LogSegment
 from core.paths import get_data_path
 from data_processing.band_dto import BandDTO
 from data_sourcing.data_models import CRSType
-from data_sourcing.geometry_toolkit import GeometryToolkit
+from data_sourcing.geometry_toolkit import GeometryToolkit, _get_transformer
 
 
 class GeometryProcessor:
@@ -33,7 +35,10 @@ class GeometryProcessor:
             LogSegment.DATA_PROCESSING,
             f"Initializing GeometryProcessor with data file: {data_file}",
         )
-        self.monthly_observations = np.load(get_data_path(data_file))
+        # memory-map the observation cube; pages are faulted in on demand,
+        # so construction is instant and only the data actually gathered
+        # downstream is ever read from disk
+        self.monthly_observations = np.load(get_data_path(data_file), mmap_mode="r")
         self.aoi_geometry = GeometryToolkit.retrieve_geometry(
             get_data_path(cf.GEOMETRY_FILE)
         )
@@ -47,6 +52,15 @@ class GeometryProcessor:
         self.resolution = cf.RESOLUTION
         self.aoi_worldcover = None
         self.pixel_coords = None
+        self._non_forest_mask = None
+        self._band_dto_cache = None
+        self._forest_mask = None
+
+        # the AOI grid is fixed for the processor's lifetime; computing the
+        # transform once spares every warp and export the Affine arithmetic
+        self.target_transform, self.height_px, self.width_px = (
+            self._compute_target_transform()
+        )
 
     @staticmethod
     def load_raster_layer(raster_file: str) -> rasterio.io.DatasetReader:
@@ -76,18 +90,17 @@ class GeometryProcessor:
             bbox_crs (CRSType): CRS that the bounding box should be in
         """
 
-        coords = geometry["coordinates"][0][0]
-
-        minx = min(x for x, y in coords)
-        miny = min(y for x, y in coords)
-        maxx = max(x for x, y in coords)
-        maxy = max(y for x, y in coords)
+        # GEOS reads the bounds straight off its coordinate buffer, and this
+        # drops the assumption about the GeoJSON nesting depth
+        minx, miny, maxx, maxy = shape(geometry).bounds
 
         if geometry_crs != bbox_crs:
             try:
-                minx, miny, maxx, maxy = transform_bounds(
-                    geometry_crs, bbox_crs, minx, miny, maxx, maxy, densify_pts=21
-                )
+                # the cached Transformer avoids rebuilding a PROJ context
+                # on every call, which dwarfs the actual transformation
+                minx, miny, maxx, maxy = _get_transformer(
+                    geometry_crs, bbox_crs
+                ).transform_bounds(minx, miny, maxx, maxy, densify_pts=21)
             except Exception as exc:
                 raise RuntimeError(
                     f"Failed to transform bounds from {geometry_crs} to {bbox_crs}: {exc}"
@@ -131,23 +144,79 @@ class GeometryProcessor:
         """
         target_transform, height_px, width_px = self.get_target_transform()
 
-        full_array = np.empty((height_px, width_px), dtype=dataset.dtypes[0])
-
-        reproject(
-            source=dataset.read(band_index),
-            destination=full_array,
-            src_transform=dataset.transform,
-            src_crs=dataset.crs,
-            dst_transform=target_transform,
-            dst_crs=dst_crs,
+        # a WarpedVRT warps lazily: GDAL pulls only the source blocks the
+        # AOI grid needs, so neither the full source nor a manual window
+        # has to be materialized here
+        with WarpedVRT(
+            dataset,
+            crs=dst_crs,
+            transform=target_transform,
+            width=width_px,
+            height=height_px,
             resampling=resampling,
-        )
+        ) as vrt:
+            full_array = vrt.read(band_index)
 
         return full_array, target_transform
 
+    def transform_and_clip_bands(
+        self,
+        dataset: rasterio.io.DatasetReader,
+        dst_crs: CRSType,
+        resampling: Resampling,
+        band_indices: list[int],
+    ) -> tuple[np.ndarray, Affine]:
+        """Reproject several raster bands to the AOI grid in parallel
+
+        GDAL releases the GIL inside the warp, so a thread per band scales
+        up to the core count. Every worker opens its own handle on the
+        source file because dataset handles are not safe for concurrent
+        reads.
+
+        Args:
+            dataset (rasterio.io.DatasetReader): Raster Dataset to be transformed
+            dst_crs (CRSType): CRS of the AOI
+            resampling (Resampling): Resampling Method
+            band_indices (list[int]): 1-based indices of the bands to transform
+
+        Returns:
+            tuple[np.ndarray, Affine]: stacked (band, height, width) array with its transform
+        """
+        target_transform, height_px, width_px = self.get_target_transform()
+        destination = np.empty(
+            (len(band_indices), height_px, width_px), dtype=dataset.dtypes[0]
+        )
+
+        def warp_band(slot: int, band_index: int) -> None:
+            with rasterio.open(dataset.name) as src:
+                with WarpedVRT(
+                    src,
+                    crs=dst_crs,
+                    transform=target_transform,
+                    width=width_px,
+                    height=height_px,
+                    resampling=resampling,
+                ) as vrt:
+                    destination[slot] = vrt.read(band_index)
+
+        max_workers = min(len(band_indices), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # consume the iterator so worker exceptions propagate
+            list(pool.map(warp_band, range(len(band_indices)), band_indices))
+
+        return destination, target_transform
+
     def get_target_transform(self) -> tuple[Affine, int, int]:
         """Extract the target transform from
 
+        Returns:
+            tuple[Affine, int, int]: returns the transform, the height (px) and width (px)
+        """
+        return self.target_transform, self.height_px, self.width_px
+
+    def _compute_target_transform(self) -> tuple[Affine, int, int]:
+        """Build the AOI grid transform from the bounding box and resolution
+
         Returns:
             tuple[Affine, int, int]: returns the transform, the height (px) and width (px)
         """
@@ -163,17 +232,55 @@ class GeometryProcessor:
 
         return target_transform, height_px, width_px
 
+    def _forest_mask_cache_path(self):
+        """Cache file for the forest mask of the current configuration
+
+        The mask only changes with the AOI bounds, the resolution or the
+        WorldCover raster itself, so those key the file name.
+
+        Returns:
+            Path: path of the cache file inside the data directory
+        """
+        worldcover_path = get_data_path(cf.WORLDCOVER_FILE)
+        key = hashlib.blake2b(
+            repr(
+                (
+                    tuple(self.aoi_bbox),
+                    self.resolution,
+                    cf.WORLDCOVER_FILE,
+                    os.path.getmtime(worldcover_path),
+                )
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+        return get_data_path("_cache") / f"forest_mask_{key}.npy"
+
     def _create_forest_mask_from_worldcover_raster(self) -> np.ndarray:
         """Returns the forest mask based on the worldcover raster
 
+        The mask is persisted to disk so warm runs skip the WorldCover
+        reprojection entirely.
+
         Returns:
             np.ndarray: Forest Mask
         """
+        if self._forest_mask is not None:
+            return self._forest_mask
+
+        cache_path = self._forest_mask_cache_path()
+        if cache_path.exists():
+            self._forest_mask = np.load(cache_path)
+            return self._forest_mask
 
         if self.aoi_worldcover is None:
             self.retrieve_worldcover_raster_for_aoi()
 
-        return self.aoi_worldcover == 10
+        forest_mask = np.equal(self.aoi_worldcover, 10)
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_path, forest_mask)
+        self._forest_mask = forest_mask
+        return forest_mask
 
     def flatten_and_filter_monthly_data(self) -> BandDTO:
         """
@@ -187,23 +294,55 @@ class GeometryProcessor:
                 These are the (y, x) indices in the original spatial grid
         """
 
+        # the observations and mask are fixed per processor, so repeat calls
+        # can reuse the gathered DTO instead of copying the cube again
+        if self._band_dto_cache is not None:
+            return self._band_dto_cache
+
         forest_mask = self._create_forest_mask_from_worldcover_raster()
 
         n_months, bands, height, width = self.monthly_observations.shape
 
-        rows, cols = np.where(forest_mask)
+        # one scan over the mask yields the flat indices; rows/cols fall out
+        # of a divmod instead of a second np.where pass
+        flat_idx = np.flatnonzero(forest_mask)
+        rows, cols = np.divmod(flat_idx, width)
         self.pixel_coords = np.column_stack([rows, cols])
         self.output_shape = (height, width)
+        self._non_forest_mask = ~forest_mask
+
+        # float32 halves the memory traffic of every downstream reduction
+        # and spatial filter while staying well above the reflectances'
+        # quantization precision; float16 halves it again where the loss
+        # of mantissa bits is acceptable
+        observation_dtype = np.float16 if cf.ALLOW_HALF_PRECISION else np.float32
+        spatial_data = np.asarray(self.monthly_observations, dtype=observation_dtype)
+
+        data_flat = spatial_data.reshape(n_months, bands, -1)
+        if flat_idx.size and flat_idx[-1] - flat_idx[0] + 1 == flat_idx.size:
+            # spatially dense mask: a plain slice is a zero-copy view
+            pixel_data = data_flat[:, :, flat_idx[0] : flat_idx[-1] + 1].transpose(
+                0, 2, 1
+            )
+        else:
+            # gather month by month straight into the preallocated
+            # contiguous (month, pixel, band) output; this keeps the
+            # transient at one (bands, pixels) slice instead of a second
+            # full-size copy of the gathered tensor
+            pixel_data = np.empty(
+                (n_months, flat_idx.size, bands), dtype=spatial_data.dtype
+            )
+            for month in range(n_months):
+                # the broadcast month/pixel indices land the gather
+                # directly in (pixel, band) order
+                pixel_data[month] = data_flat[month, :, flat_idx]
 
-        data_flat = self.monthly_observations.reshape(n_months, bands, -1)
-        mask_flat = forest_mask.flatten()
-        pixel_data = data_flat[:, :, mask_flat].transpose(0, 2, 1)
-
-        return BandDTO(
+        self._band_dto_cache = BandDTO(
             pixel_list=pixel_data,
             pixel_coords=self.pixel_coords,
-            spatial_data=self.monthly_observations,
+            spatial_data=spatial_data,
         )
+        return self._band_dto_cache
 
     def reconstruct_2d(self, values: np.ndarray) -> np.ndarray:
         """Reconstruct 2D array from flat values and coordinates.
@@ -214,7 +353,18 @@ class GeometryProcessor:
         Returns:
             np.ndarray: Shape (height, width) with values placed at coordinates, NaN elsewhere
         """
-        result = np.full(self.output_shape, np.nan)
+        dtype = (
+            values.dtype if np.issubdtype(values.dtype, np.floating) else np.float32
+        )
+
+        if self._non_forest_mask is not None:
+            # fill only the non-forest pixels with NaN instead of blanketing
+            # the whole grid first and overwriting the forest pixels again
+            result = np.empty(self.output_shape, dtype=dtype)
+            result[self._non_forest_mask] = np.nan
+        else:
+            result = np.full(self.output_shape, np.nan, dtype=dtype)
+
         result[self.pixel_coords[:, 0], self.pixel_coords[:, 1]] = values
         return result
 
@@ -228,20 +378,26 @@ class GeometryProcessor:
             output_path (str): Path where the GeoTIFF should be saved
             nodata_value (float): Value to use for NoData pixels (default: -9999.0)
         """
-        reconstructed = self.reconstruct_2d(values)
-
-        reconstructed = np.where(np.isnan(reconstructed), nodata_value, reconstructed)
-
-        if self.aoi_worldcover is None:
-            _, transform, crs = self.retrieve_worldcover_raster_for_aoi()
-        else:
-            minx_aoi, miny_aoi, maxx_aoi, maxy_aoi = self.aoi_bbox
-            width_px = int((maxx_aoi - minx_aoi) / self.resolution)
-            height_px = int((maxy_aoi - miny_aoi) / self.resolution)
-            transform = from_bounds(
-                minx_aoi, miny_aoi, maxx_aoi, maxy_aoi, width_px, height_px
+        if np.issubdtype(values.dtype, np.integer):
+            # integer values (e.g. cluster labels) are written in their
+            # native narrow dtype; NaN cannot mark the gaps, so the grid is
+            # pre-filled with the nodata value instead
+            reconstructed = np.full(
+                self.output_shape, values.dtype.type(nodata_value), dtype=values.dtype
             )
-            crs = "EPSG:3857"
+            reconstructed[self.pixel_coords[:, 0], self.pixel_coords[:, 1]] = values
+            # horizontal differencing; the floating-point predictor is not
+            # valid for integer samples
+            predictor = 2
+        else:
+            # float32 halves the written bytes and enables the floating-point
+            # predictor below; the values never carry float64 precision anyway
+            reconstructed = self.reconstruct_2d(values).astype(np.float32, copy=False)
+            np.nan_to_num(reconstructed, copy=False, nan=nodata_value)
+            predictor = 3
+
+        transform = self.target_transform
+        crs = "EPSG:3857"
 
         with rasterio.open(
             output_path,
@@ -254,6 +410,12 @@ class GeometryProcessor:
             crs=crs,
             transform=transform,
             nodata=nodata_value,
+            tiled=True,
+            blockxsize=512,
+            blockysize=512,
+            compress="deflate",
+            predictor=predictor,
+            BIGTIFF="IF_SAFER",
         ) as dst:
             dst.write(reconstructed, 1)
 
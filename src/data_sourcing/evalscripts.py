@@ -42,8 +42,8 @@ function setup() {
     input: ["B02", "B03", "B04", "B05", "B06", "B07", "B08", "B11", "B12", "SCL"],
     output: [{ id: 'bands',
               bands: 9,
-              sampleType: 'FLOAT32'},
-              
+              sampleType: 'UINT16'},
+
               { id: 'scl',
               bands: 1,
               sampleType: 'UINT8'}
@@ -51,8 +51,10 @@ function setup() {
   };
 }
 
+// reflectance is scaled to its native digital-number range so the raw bands
+// transfer and store as UINT16 instead of FLOAT32
 function evaluatePixel(sample) {
-  return { bands: [sample.B02, sample.B03, sample.B04, sample.B05, sample.B06, sample.B07, sample.B08, sample.B11, sample.B12],
+  return { bands: [10000 * sample.B02, 10000 * sample.B03, 10000 * sample.B04, 10000 * sample.B05, 10000 * sample.B06, 10000 * sample.B07, 10000 * sample.B08, 10000 * sample.B11, 10000 * sample.B12],
            scl: [sample.SCL]
           };
 }
@@ -91,24 +93,35 @@ function setup() {
   };
 }
 
-function getFirstQuartile(values) {
-  try {
-    if (!values || values.length === 0) return 0;
-    values.sort((a,b) => a-b);
-    var index = Math.floor(values.length / 4);
-    return values[index] || 0;
-  } catch (e) {
-    return 0;
+// lookup table over SCL classes 0-11; true marks an invalid observation
+// (no data, saturated, shadow, cloud, cirrus, snow)
+var INVALID_SCL = [true, true, false, true, false, false, false, true, true, true, true, false];
+
+// Hoare quickselect over the first n entries of a typed array; O(n)
+// instead of the O(n log n) full sort the quartile only needs a fraction of
+function selectKth(values, n, k) {
+  var lo = 0, hi = n - 1;
+  while (hi > lo) {
+    var pivot = values[(lo + hi) >> 1];
+    var i = lo, j = hi;
+    while (i <= j) {
+      while (values[i] < pivot) i++;
+      while (values[j] > pivot) j--;
+      if (i <= j) {
+        var tmp = values[i]; values[i] = values[j]; values[j] = tmp;
+        i++; j--;
+      }
+    }
+    if (k <= j) hi = j;
+    else if (k >= i) lo = i;
+    else break;
   }
+  return values[k];
 }
 
-function validate(sample) {
-  try {
-    const invalid = [0, 1, 3, 7, 8, 9, 10];
-    return sample && sample.SCL !== undefined && !invalid.includes(sample.SCL);
-  } catch (e) {
-    return false;
-  }
+function getFirstQuartile(values, n) {
+  if (n === 0) return 0;
+  return selectKth(values, n, Math.floor(n / 4)) || 0;
 }
 
 function safeDiv(numerator, denominator, defaultValue = 0) {
@@ -132,18 +145,33 @@ function evaluatePixel(samples) {
       };
     }
 
-    var valid = samples.filter(validate);
-    if (valid.length > 0) {
+    // one pass over the samples fills per-band typed arrays, replacing the
+    // filter() array plus nine map() allocations
+    var n = samples.length;
+    var b02 = new Float32Array(n), b03 = new Float32Array(n), b04 = new Float32Array(n);
+    var b05 = new Float32Array(n), b06 = new Float32Array(n), b07 = new Float32Array(n);
+    var b08 = new Float32Array(n), b11 = new Float32Array(n), b12 = new Float32Array(n);
+    var count = 0;
+    for (var i = 0; i < n; i++) {
+      var s = samples[i];
+      if (!s || s.SCL === undefined || INVALID_SCL[s.SCL]) continue;
+      b02[count] = s.B02; b03[count] = s.B03; b04[count] = s.B04;
+      b05[count] = s.B05; b06[count] = s.B06; b07[count] = s.B07;
+      b08[count] = s.B08; b11[count] = s.B11; b12[count] = s.B12;
+      count++;
+    }
+
+    if (count > 0) {
         let cl = {
-            b02: getFirstQuartile(valid.map(s => s.B02)),
-            b03: getFirstQuartile(valid.map(s => s.B03)),
-            b04: getFirstQuartile(valid.map(s => s.B04)),
-            b05: getFirstQuartile(valid.map(s => s.B05)),
-            b06: getFirstQuartile(valid.map(s => s.B06)),
-            b07: getFirstQuartile(valid.map(s => s.B07)),
-            b08: getFirstQuartile(valid.map(s => s.B08)),
-            b11: getFirstQuartile(valid.map(s => s.B11)),
-            b12: getFirstQuartile(valid.map(s => s.B12)),
+            b02: getFirstQuartile(b02, count),
+            b03: getFirstQuartile(b03, count),
+            b04: getFirstQuartile(b04, count),
+            b05: getFirstQuartile(b05, count),
+            b06: getFirstQuartile(b06, count),
+            b07: getFirstQuartile(b07, count),
+            b08: getFirstQuartile(b08, count),
+            b11: getFirstQuartile(b11, count),
+            b12: getFirstQuartile(b12, count),
         };
 
         let l = 0.5;
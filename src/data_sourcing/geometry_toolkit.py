@@ -1,13 +1,17 @@
+import functools
+import os
+
 import geojson
 import numpy as np
 import rasterio
+import shapely
 from pyproj import Transformer
 from rasterio.transform import from_bounds
 from sentinelhub import CRS, BBox
 from shapely import Geometry
 from shapely.geometry import box, shape
 from shapely.geometry.base import BaseGeometry
-from shapely.ops import transform
+from shapely.prepared import prep
 
 import config as cf
 from core.logger import Logger, LogSegment
@@ -15,10 +19,50 @@ from core.paths import get_data_path
 from data_sourcing.data_models import CRSType
 
 
+@functools.lru_cache(maxsize=32)
+def _load_geometry_cached(geojson_path: str, mtime: float) -> dict:
+    """Parse a geojson file once per (path, mtime) combination.
+
+    The AOI file is read by several components; keying on the modification
+    time keeps the cache valid when the file changes on disk.
+    """
+    with open(geojson_path) as f:
+        geo_file = geojson.load(f)
+
+    return geo_file["features"][0]["geometry"]
+
+
+@functools.lru_cache(maxsize=32)
+def _get_transformer(src_crs: CRSType, dst_crs: CRSType) -> Transformer:
+    """Return a cached pyproj Transformer for the given CRS pair.
+
+    Building a Transformer initializes a PROJ context, which is expensive
+    enough to dominate when called once per tile.
+    """
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+
+def _transform_geometry(
+    geometry: BaseGeometry, transformer: Transformer
+) -> BaseGeometry:
+    """Reproject a geometry by transforming all vertices in one batch.
+
+    shapely.transform hands the full coordinate array to pyproj at once,
+    instead of shapely.ops.transform's per-vertex python iteration.
+    """
+
+    def _project(coords: np.ndarray) -> np.ndarray:
+        xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([xs, ys])
+
+    return shapely.transform(geometry, _project)
+
+
 class GeometryToolkit:
     aoi_geometry: dict
     aoi_geometry_shape: Geometry
-    tiles: np.ndarray
+    tile_xs: np.ndarray
+    tile_ys: np.ndarray
     resolution: int
     max_dimension: int
     aoi_crs: CRSType
@@ -37,6 +81,7 @@ class GeometryToolkit:
             f"Initializing GeometryToolkit with resolution {resolution}m",
         )
         self.resolution = resolution
+        self._inv_resolution = 1.0 / resolution
         self.max_dimension = max_dimension
         self.aoi_crs = aoi_crs
 
@@ -45,6 +90,10 @@ class GeometryToolkit:
         self.aoi_geometry_shape = shape(self.aoi_geometry)
 
         self._geometry_3857: BaseGeometry | None = None
+        self._geometry_by_crs: dict[CRSType, BaseGeometry] = {}
+        self._prepared_3857 = None
+        self._bounds_3857: tuple[float, float, float, float] | None = None
+        self._intersection_mask: np.ndarray | None = None
         self.get_tiling_bounds()
 
     @staticmethod
@@ -58,10 +107,8 @@ class GeometryToolkit:
         Returns:
             dict: geometry of geojson
         """
-        with open(geojson_path) as f:
-            geo_file = geojson.load(f)
-
-        return geo_file["features"][0]["geometry"]
+        path = os.fspath(geojson_path)
+        return _load_geometry_cached(path, os.path.getmtime(path))
 
     def get_tiling_bounds(self) -> np.ndarray:
         """
@@ -73,10 +120,9 @@ class GeometryToolkit:
             Array with the corners of all tiles
         """
 
-        project = Transformer.from_crs(
-            self.aoi_crs, "EPSG:3857", always_xy=True
-        ).transform
-        geom_m = transform(project, self.aoi_geometry_shape)
+        geom_m = _transform_geometry(
+            self.aoi_geometry_shape, _get_transformer(self.aoi_crs, "EPSG:3857")
+        )
 
         minx, miny, maxx, maxy = geom_m.bounds
         width_m = maxx - minx
@@ -88,16 +134,28 @@ class GeometryToolkit:
         width_tiles = int(np.ceil(width_px / self.max_dimension))
         height_tiles = int(np.ceil(height_px / self.max_dimension))
 
-        tiles = np.zeros(shape=(height_tiles + 1, width_tiles + 1, 2))
+        # the corner grid is the outer product of two clipped coordinate
+        # vectors; store just the vectors and materialize the dense grid
+        # only when someone asks for it
+        step = self.max_dimension * self.resolution
+        self.tile_xs = np.minimum(minx + np.arange(width_tiles + 1) * step, maxx)
+        self.tile_ys = np.minimum(miny + np.arange(height_tiles + 1) * step, maxy)
+        self._tiles = None
+        self._intersection_mask = None
 
-        for i in range(height_tiles + 1):
-            for j in range(width_tiles + 1):
-                x = min(minx + j * self.max_dimension * self.resolution, maxx)
-                y = min(miny + i * self.max_dimension * self.resolution, maxy)
-                tiles[i, j] = [x, y]
+        return self.tiles
 
-        self.tiles = tiles
-        return tiles
+    @property
+    def tiles(self) -> np.ndarray:
+        """Dense (height_tiles + 1, width_tiles + 1, 2) corner grid.
+
+        Built lazily from the separable coordinate vectors for callers
+        that want the full array-of-corners layout.
+        """
+        if self._tiles is None:
+            grid_x, grid_y = np.meshgrid(self.tile_xs, self.tile_ys)
+            self._tiles = np.stack([grid_x, grid_y], axis=-1)
+        return self._tiles
 
     def get_geometry_as_3857(self) -> BaseGeometry:
         """
@@ -105,11 +163,8 @@ class GeometryToolkit:
         Use this to pre-transform geometry for better performance.
         """
         if self._geometry_3857 is None:
-            transformer = Transformer.from_crs(
-                self.aoi_crs, "EPSG:3857", always_xy=True
-            )
-            self._geometry_3857 = transform(
-                transformer.transform, self.aoi_geometry_shape
+            self._geometry_3857 = _transform_geometry(
+                self.aoi_geometry_shape, _get_transformer(self.aoi_crs, "EPSG:3857")
             )
         return self._geometry_3857
 
@@ -127,11 +182,75 @@ class GeometryToolkit:
         bool
             True if bbox intersects geometry, False otherwise
         """
+        geometry_3857 = self.get_geometry_as_3857()
+
+        if self._prepared_3857 is None:
+            # prepared geometries index the polygon edges once, making each
+            # of the per-tile intersects calls O(log n)
+            self._prepared_3857 = prep(geometry_3857)
+            self._bounds_3857 = geometry_3857.bounds
+
+        # envelope rejection before any GEOS work
+        geom_minx, geom_miny, geom_maxx, geom_maxy = self._bounds_3857
+        if (
+            bbox.max_x < geom_minx
+            or bbox.min_x > geom_maxx
+            or bbox.max_y < geom_miny
+            or bbox.min_y > geom_maxy
+        ):
+            return False
+
         bbox_geom = box(bbox.min_x, bbox.min_y, bbox.max_x, bbox.max_y)
 
-        geometry_3857 = self.get_geometry_as_3857()
+        return self._prepared_3857.intersects(bbox_geom)
+
+    def get_tile_intersection_mask(self) -> np.ndarray:
+        """
+        Test all tiles of the tiling grid against the AOI geometry at once.
+
+        Building the tile boxes and testing them with shapely's vectorized
+        ufuncs replaces the per-tile python-level intersection loop. The
+        result is cached - neither the grid nor the AOI changes between
+        monthly download iterations.
+
+        Returns:
+            np.ndarray: Boolean mask of shape (height_tiles, width_tiles)
+                that is True where the tile intersects the AOI geometry
+        """
+        if self._intersection_mask is None:
+            xs = self.tile_xs
+            ys = self.tile_ys
+            geometry_3857 = self.get_geometry_as_3857()
+
+            # cheap envelope pre-filter: tiles whose AABB misses the AOI
+            # bounds can never intersect, so no polygon is built for them
+            gminx, gminy, gmaxx, gmaxy = geometry_3857.bounds
+            col_overlap = (xs[1:] > gminx) & (xs[:-1] < gmaxx)
+            row_overlap = (ys[1:] > gminy) & (ys[:-1] < gmaxy)
+            candidates = row_overlap[:, np.newaxis] & col_overlap[np.newaxis, :]
+
+            mask = np.zeros(candidates.shape, dtype=bool)
+            rows, cols = np.nonzero(candidates)
+            if rows.size:
+                boxes = shapely.box(xs[cols], ys[rows], xs[cols + 1], ys[rows + 1])
+                mask[rows, cols] = shapely.intersects(boxes, geometry_3857)
 
-        return bbox_geom.intersects(geometry_3857)
+            self._intersection_mask = mask
+
+        return self._intersection_mask
+
+    def select_intersecting_tiles(self) -> list[tuple[int, int]]:
+        """
+        Indices of all tiles of the tiling grid that intersect the AOI.
+
+        Thin wrapper over the vectorized intersection mask for callers
+        that iterate tiles one by one.
+
+        Returns:
+            list[tuple[int, int]]: (y, x) index pairs of intersecting tiles
+        """
+        mask = self.get_tile_intersection_mask()
+        return [(int(y), int(x)) for y, x in zip(*np.nonzero(mask))]
 
     def get_bbox(self, y: int, x: int) -> BBox:
         """
@@ -144,19 +263,18 @@ class GeometryToolkit:
         Returns:
             BBox: Bounding Box of tile at y, x
         """
-        tile_coords = np.array(
-            [
-                [self.tiles[y, x], self.tiles[y, x + 1]],
-                [self.tiles[y + 1, x], self.tiles[y + 1, x + 1]],
-            ]
+        # the coordinate vectors are monotonic by construction, so the
+        # neighbouring entries already are the extremes
+        return BBox(
+            bbox=[
+                self.tile_xs[x],
+                self.tile_ys[y],
+                self.tile_xs[x + 1],
+                self.tile_ys[y + 1],
+            ],
+            crs=CRS.POP_WEB,
         )
 
-        flat_coords = tile_coords.reshape(-1, 2)
-        xs = flat_coords[:, 0]
-        ys = flat_coords[:, 1]
-
-        return BBox(bbox=[xs.min(), ys.min(), xs.max(), ys.max()], crs=CRS.POP_WEB)
-
     def get_pixels(self, bbox: BBox) -> tuple[int, int]:
         """
         Calculate the width and height of a bbox in pixels
@@ -171,8 +289,11 @@ class GeometryToolkit:
         width_m = bbox.max_x - bbox.min_x
         height_m = bbox.max_y - bbox.min_y
 
-        width_px = int(width_m / self.resolution)
-        height_px = int(height_m / self.resolution)
+        # multiply by the cached reciprocal instead of dividing per call;
+        # the half-ulp nudge keeps truncation from flipping on values that
+        # land an epsilon below a whole pixel count
+        width_px = int(width_m * self._inv_resolution + 1e-9)
+        height_px = int(height_m * self._inv_resolution + 1e-9)
 
         return width_px, height_px
 
@@ -205,9 +326,17 @@ class GeometryToolkit:
 
         if crs == "EPSG:3857":
             geometry_crs = self.get_geometry_as_3857()
+        elif crs == self.aoi_crs:
+            # already in the requested CRS - skip the no-op reprojection copy
+            geometry_crs = self.aoi_geometry_shape
         else:
-            transformer = Transformer.from_crs(self.aoi_crs, crs, always_xy=True)
-            geometry_crs = transform(transformer.transform, self.aoi_geometry_shape)
+            # repeated exports to the same CRS reuse the reprojected shape
+            geometry_crs = self._geometry_by_crs.get(crs)
+            if geometry_crs is None:
+                geometry_crs = _transform_geometry(
+                    self.aoi_geometry_shape, _get_transformer(self.aoi_crs, crs)
+                )
+                self._geometry_by_crs[crs] = geometry_crs
 
         minx, miny, maxx, maxy = geometry_crs.bounds
 
@@ -221,17 +350,38 @@ class GeometryToolkit:
             "dtype": data.dtype,
             "crs": crs,
             "transform": transform_affine,
+            # tiled layout allows windowed reads downstream instead of
+            # decoding whole strips; BIGTIFF engages only when needed
+            "tiled": True,
+            "blockxsize": 512,
+            "blockysize": 512,
+            "num_threads": "ALL_CPUS",
+            "BIGTIFF": "IF_SAFER",
         }
 
         if compress:
             write_options["compress"] = compress
+            # de-correlate neighboring pixels before the entropy coder;
+            # predictor 3 is the floating-point variant
+            write_options["predictor"] = (
+                3 if np.issubdtype(data.dtype, np.floating) else 2
+            )
 
         if nodata_value is not None:
             write_options["nodata"] = nodata_value
 
-        # Write the GeoTIFF
+        # Write the GeoTIFF block by block so GDAL flushes each tile as it
+        # goes instead of committing the whole raster in one buffer
         with rasterio.open(output_path, "w", **write_options) as dst:
-            dst.write(data)
+            for _, window in dst.block_windows(1):
+                dst.write(
+                    data[
+                        :,
+                        window.row_off : window.row_off + window.height,
+                        window.col_off : window.col_off + window.width,
+                    ],
+                    window=window,
+                )
 
         self.logger.info(
             LogSegment.GEOMETRY_TOOLKIT, f"GeoTIFF saved to: {output_path}"
@@ -1,10 +1,20 @@
+import functools
+import json
 import os
+import random
+import threading
 import time
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from dotenv import load_dotenv
 from oauthlib.oauth2 import BackendApplicationClient
 from requests import HTTPError, Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 from requests_oauthlib import OAuth2Session
 
@@ -14,6 +24,59 @@ from data_sourcing.data_models import CRSType, EvalScriptType
 from data_sourcing.evalscripts import get_evalscript, get_response_setup
 
 
+def _dumps(obj: dict) -> bytes:
+    """Serialize a request body to JSON bytes.
+
+    Uses orjson when it is installed (roughly 3-10x faster than the stdlib
+    codec), otherwise compact stdlib json.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+@functools.lru_cache(maxsize=8)
+def _request_template(evalscript_type: EvalScriptType) -> dict:
+    """Constant request parts for an evalscript type, resolved once.
+
+    The evalscript text, response setup and processing block never change
+    between calls, so build_json_request only has to fill in the per-tile
+    bounds and per-month time range.
+    """
+    if evalscript_type == "INDICES":
+        processing_block = {"mosaicking": "ORBIT"}
+        extra_filter = {}
+    else:
+        processing_block = {}
+        extra_filter = {"mosaickingOrder": "leastCC", "maxCloudCoverage": 20}
+
+    return {
+        "evalscript": get_evalscript(evalscript_type),
+        "responses": get_response_setup(evalscript_type),
+        "processing": processing_block,
+        "extra_filter": extra_filter,
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _data_filter(
+    evalscript_type: EvalScriptType, start_date: datetime, end_date: datetime
+) -> dict:
+    """The dataFilter block for one monthly interval, formatted once.
+
+    Every tile of a month shares the same interval, so the date formatting
+    and dict assembly happen once per month instead of once per tile. The
+    returned dict is shared and must not be mutated.
+    """
+    return {
+        "timeRange": {
+            "from": f"{start_date.strftime('%Y-%m-%d')}T00:00:00Z",
+            "to": f"{end_date.strftime('%Y-%m-%d')}T23:59:59Z",
+        },
+        **_request_template(evalscript_type)["extra_filter"],
+    }
+
+
 class SentinelHubAPI:
     logger: Logger
     json_request: dict
@@ -23,6 +86,9 @@ class SentinelHubAPI:
         self.logger.info(LogSegment.SENTINEL_API, "Initializing SentinelHub API")
         self.retrieve_secrets()
         self.json_request = None
+        self._token: dict | None = None
+        self._token_expiry: float = 0.0
+        self._token_lock = threading.Lock()
         self.logger.info(
             LogSegment.SENTINEL_API, "SentinelHub API initialized successfully"
         )
@@ -58,6 +124,15 @@ class SentinelHubAPI:
 
         client = BackendApplicationClient(client_id=client_id)
         self.oauth = OAuth2Session(client=client)
+
+        # size the connection pool to the download concurrency so parallel
+        # tile fetches reuse keep-alive connections instead of queueing on
+        # the default pool or opening fresh TLS handshakes
+        adapter = HTTPAdapter(
+            pool_connections=conf.MAX_CONCURRENT_REQUESTS,
+            pool_maxsize=conf.MAX_CONCURRENT_REQUESTS,
+        )
+        self.oauth.mount("https://", adapter)
         self.client_secret
         self.token_url
 
@@ -107,27 +182,8 @@ class SentinelHubAPI:
                 f"The API allows for a maximum of 2500 pixels. {height_px} is too high."
             )
 
-        evalscript = get_evalscript(evalscript_type)
-        responses = get_response_setup(evalscript_type)
-
-        if evalscript_type == "INDICES":
-            processing_block = {"mosaicking": "ORBIT"}
-            data_filter = {
-                "timeRange": {
-                    "from": f"{start_date.strftime('%Y-%m-%d')}T00:00:00Z",
-                    "to": f"{end_date.strftime('%Y-%m-%d')}T23:59:59Z",
-                }
-            }
-        else:
-            processing_block = {}
-            data_filter = {
-                "timeRange": {
-                    "from": f"{start_date.strftime('%Y-%m-%d')}T00:00:00Z",
-                    "to": f"{end_date.strftime('%Y-%m-%d')}T23:59:59Z",
-                },
-                "mosaickingOrder": "leastCC",
-                "maxCloudCoverage": 20,
-            }
+        template = _request_template(evalscript_type)
+        data_filter = _data_filter(evalscript_type, start_date, end_date)
 
         json_request = {
             "input": {
@@ -136,12 +192,16 @@ class SentinelHubAPI:
                     {
                         "type": conf.COLLECTION_ID.upper(),
                         "dataFilter": data_filter,
-                        "processing": processing_block,
+                        "processing": template["processing"],
                     }
                 ],
             },
-            "output": {"width": width_px, "height": height_px, "responses": responses},
-            "evalscript": evalscript,
+            "output": {
+                "width": width_px,
+                "height": height_px,
+                "responses": template["responses"],
+            },
+            "evalscript": template["evalscript"],
         }
 
         if crs == "EPSG:3857":
@@ -163,68 +223,123 @@ class SentinelHubAPI:
         self.json_request = json_request
         return json_request
 
-    def send_request(
-        self,
-    ) -> Response:
+    def _get_token(self) -> dict:
+        """
+        Return a cached OAuth token, fetching a new one only when near expiry.
+
+        Fetching a token is a full round-trip to the identity provider, so
+        doing it once per batch instead of once per request removes a fixed
+        100-500ms from every tile download. The token is refreshed 60 seconds
+        before its advertised expiry to stay clear of clock skew.
+
+        Returns
+        -------
+        dict
+            A valid OAuth token
+        """
+        with self._token_lock:
+            if self._token is None or time.monotonic() >= self._token_expiry:
+                self._token = self.oauth.fetch_token(
+                    token_url=self.token_url,
+                    client_secret=self.client_secret,
+                    include_client_id=True,
+                )
+                self._token_expiry = (
+                    time.monotonic() + self._token.get("expires_in", 600) - 60
+                )
+            return self._token
+
+    def send_request(self, json_request: dict | None = None) -> Response:
         """
         Sends the request to the sentinel hub process API.
 
         Parameters
         ----------
-        client_secret : str
-            The secret to retrieve the access token
-        token_url : str
-            The url where the token should be retrieved
-        oauth: OAuth2Session
-            The OAuthSession to retrieve the token
-        json_request: dict
-            The request in JSON format
+        json_request: dict | None
+            The request in JSON format. Falls back to the request built last
+            via build_json_request. Pass it explicitly when sending from
+            multiple threads so requests do not race on the shared state.
 
         Returns
         -------
         Response
             Response of the sentinel hub process API
         """
-        if self.json_request is None:
+        if json_request is None:
+            json_request = self.json_request
+
+        if json_request is None:
             self.logger.error(
                 LogSegment.SENTINEL_API, "JSON-Request was not built before sending"
             )
             raise ValueError("JSON-Request was not built")
 
-        token = self.oauth.fetch_token(
-            token_url=self.token_url,
-            client_secret=self.client_secret,
-            include_client_id=True,
-        )
+        token = self._get_token()
 
         url_request = "https://sh.dataspace.copernicus.eu/api/v1/process"
         headers_request = {
             "Authorization": f"Bearer {token['access_token']}",
             "Content-Type": "application/json",
+            # compressible payloads (JSON errors, deflate-friendly TIFFs)
+            # shrink on the wire; requests decodes transparently
+            "Accept-Encoding": "gzip, deflate",
         }
 
+        # stream=True defers the body download; the caller pulls it in
+        # chunks instead of requests buffering it eagerly on receipt
         response = self.oauth.post(
-            url_request, headers=headers_request, json=self.json_request
+            url_request,
+            headers=headers_request,
+            data=_dumps(json_request),
+            stream=True,
         )
 
         return response
 
-    def safe_send_request(self, max_retries=3) -> Response:
+    @staticmethod
+    def _backoff_wait(retries: int, floor_sec: float = 0.0) -> float:
+        """
+        Jittered exponential backoff wait time, in seconds.
+
+        Randomizing the wait decorrelates concurrent tile requests that all
+        hit a rate limit at the same moment, so the retries do not collide
+        again in lockstep.
+
+        Parameters
+        ----------
+        retries: int
+            Number of attempts made so far
+        floor_sec: float
+            Lower bound for the wait, e.g. a server-sent Retry-After
+
+        Returns
+        -------
+        float
+            Seconds to wait before the next attempt
+        """
+        base, cap = 0.5, 16.0
+        wait = min(cap, random.uniform(base, base * 2**retries))
+        return max(wait, floor_sec)
+
+    def safe_send_request(
+        self,
+        max_retries=3,
+        json_request: dict | None = None,
+        overall_timeout_s: float | None = None,
+    ) -> Response:
         """
         Safely sends a request with retry logic for rate limits and server errors.
 
         Parameters
         ----------
-        client_secret : str
-            The secret to retrieve the access token
-        token_url : str
-            The url where the token should be retrieved
-        oauth: OAuth2Session
-            The OAuthSession to retrieve the token
-        json_request: dict
-            The request in JSON format
         max_retries: int
             Maximum number of retry attempts
+        json_request: dict | None
+            The request in JSON format. Falls back to the request built last
+            via build_json_request
+        overall_timeout_s: float | None
+            Total retry budget in seconds. When set, the loop gives up
+            deterministically instead of sleeping past the deadline.
 
         Returns
         -------
@@ -236,24 +351,40 @@ class SentinelHubAPI:
         HTTPError
             If the request fails after all retries
         RuntimeError
-            If maximum retries exceeded
+            If maximum retries exceeded or the retry budget is exhausted
         """
         retries = 0
+        deadline = (
+            None
+            if overall_timeout_s is None
+            else time.monotonic() + overall_timeout_s
+        )
 
         while retries < max_retries:
             try:
-                response = self.send_request()
+                response = self.send_request(json_request)
 
                 if response.status_code == 200:
-                    self.logger.info(LogSegment.SENTINEL_API, "Request successful")
+                    self.logger.debug(LogSegment.SENTINEL_API, "Request successful")
                     return response
                 elif response.status_code == 429:
+                    # streamed responses hold their connection until the body
+                    # is consumed; drop it before waiting for the retry
+                    response.close()
                     retry_after_ms = response.headers.get("retry-after", "2000")
                     try:
-                        wait_time_ms = int(retry_after_ms)
-                        wait_time_sec = wait_time_ms / 1000.0
+                        retry_after_sec = int(retry_after_ms) / 1000.0
                     except (ValueError, TypeError):
-                        wait_time_sec = 2.0
+                        retry_after_sec = 2.0
+
+                    # the server-sent Retry-After is a floor, the jitter on
+                    # top spreads concurrent retries apart
+                    wait_time_sec = self._backoff_wait(retries, retry_after_sec)
+
+                    if deadline is not None and time.monotonic() + wait_time_sec > deadline:
+                        raise RuntimeError(
+                            f"Retry budget of {overall_timeout_s}s exhausted"
+                        )
 
                     self.logger.warning(
                         LogSegment.SENTINEL_API,
@@ -263,10 +394,17 @@ class SentinelHubAPI:
                     retries += 1
 
                 elif response.status_code in [500, 502, 503, 504]:
-                    wait_time = min(2**retries, 16)
+                    response.close()
+                    wait_time = self._backoff_wait(retries)
+
+                    if deadline is not None and time.monotonic() + wait_time > deadline:
+                        raise RuntimeError(
+                            f"Retry budget of {overall_timeout_s}s exhausted"
+                        )
+
                     self.logger.warning(
                         LogSegment.SENTINEL_API,
-                        f"Server error {response.status_code} (attempt {retries + 1}/{max_retries}). Waiting {wait_time} seconds...",
+                        f"Server error {response.status_code} (attempt {retries + 1}/{max_retries}). Waiting {wait_time:.1f} seconds...",
                     )
                     time.sleep(wait_time)
 
@@ -286,10 +424,10 @@ class SentinelHubAPI:
 
             except RequestException as e:
                 if retries < max_retries - 1:
-                    wait_time = min(2**retries, 8)
+                    wait_time = self._backoff_wait(retries)
                     self.logger.warning(
                         LogSegment.SENTINEL_API,
-                        f"Network error (attempt {retries + 1}/{max_retries}): {e}. Waiting {wait_time} seconds...",
+                        f"Network error (attempt {retries + 1}/{max_retries}): {e}. Waiting {wait_time:.1f} seconds...",
                     )
                     time.sleep(wait_time)
 
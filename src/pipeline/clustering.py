@@ -1,6 +1,10 @@
 import numpy as np
-from sklearn.cluster import KMeans, kmeans_plusplus
-from sklearn.preprocessing import MinMaxScaler
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 import config as cf
 from core.logger import Logger, LogSegment
@@ -25,20 +29,76 @@ class ClusteringPipeline:
         logger.info(LogSegment.CLUSTERING, "Calculating features for clustering")
         feature_df = fs.calculate_features_for_monthly_data()
 
-        logger.info(LogSegment.CLUSTERING, "Normalizing features with MinMaxScaler")
-        scaler = MinMaxScaler()
-        feature_norm = scaler.fit_transform(feature_df)
+        logger.info(LogSegment.CLUSTERING, "Normalizing features in place")
+        # min-max scale in place on a single float32 buffer instead of the
+        # float64 copies MinMaxScaler makes
+        feature_norm = np.ascontiguousarray(feature_df.to_numpy(), dtype=np.float32)
+        col_min = feature_norm.min(axis=0)
+        col_range = feature_norm.max(axis=0) - col_min
+        col_range[col_range == 0] = 1.0
+        feature_norm -= col_min
+        feature_norm *= 1.0 / col_range
 
         logger.info(
-            LogSegment.CLUSTERING, f"Initializing K-means++ with {n_clusters} clusters"
-        )
-        centroids, _ = kmeans_plusplus(
-            feature_norm, n_clusters=n_clusters, random_state=20
+            LogSegment.CLUSTERING,
+            f"Seeding {n_clusters} centroids with mini-batch k-means",
         )
-        kmeans = KMeans(n_clusters=n_clusters, random_state=20, init=centroids)
+        # a short mini-batch warm-up only touches O(k * batch_size) samples
+        # per pass, unlike kmeans_plusplus which scans the full matrix k times
+        mbk = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            random_state=20,
+            batch_size=4096,
+            n_init=3,
+            max_iter=10,
+        ).fit(feature_norm)
+        centroids = mbk.cluster_centers_
+        use_faiss = cf.USE_FAISS_KMEANS
+        if use_faiss and faiss is None:
+            logger.warning(
+                LogSegment.CLUSTERING,
+                "USE_FAISS_KMEANS is set but faiss is not installed, "
+                "falling back to scikit-learn",
+            )
+            use_faiss = False
 
         logger.info(LogSegment.CLUSTERING, "Running K-means clustering")
-        labels = kmeans.fit_predict(feature_norm)
+        if use_faiss:
+            # faiss runs Lloyd iterations with SIMD-optimized float32 L2
+            # kernels, which is substantially faster than sklearn for
+            # raster-scale sample counts
+            km = faiss.Kmeans(
+                d=feature_norm.shape[1],
+                k=n_clusters,
+                niter=20,
+                seed=20,
+                nredo=1,
+                verbose=False,
+                gpu=False,
+            )
+            km.train(feature_norm, init_centroids=centroids.astype(np.float32))
+            _, labels = km.index.search(feature_norm, 1)
+            labels = labels.ravel()
+        else:
+            # at small k Elkan's triangle-inequality bounds skip most of the
+            # N*k distance evaluations per Lloyd iteration, and the warm
+            # mini-batch start lets a relaxed tolerance converge early
+            kmeans = KMeans(
+                n_clusters=n_clusters,
+                random_state=20,
+                init=centroids,
+                n_init=1,
+                algorithm="elkan",
+                tol=1e-3,
+                max_iter=100,
+                copy_x=False,
+            )
+            labels = kmeans.fit_predict(feature_norm)
+
+        # for realistic cluster counts a narrow unsigned dtype cuts label
+        # memory and on-disk size roughly 8x versus the default int64
+        label_dtype = np.uint8 if n_clusters <= 255 else np.uint16
+        labels = labels.astype(label_dtype, copy=False)
 
         path = (
             output_path
@@ -47,7 +107,9 @@ class ClusteringPipeline:
         )
 
         logger.info(LogSegment.CLUSTERING, f"Exporting cluster labels to {path}")
-        gp.export_reconstruction_as_geotiff(labels, path)
+        gp.export_reconstruction_as_geotiff(
+            labels, path, nodata_value=np.iinfo(label_dtype).max
+        )
         logger.info(LogSegment.CLUSTERING, "Clustering pipeline completed successfully")
         logger._flush_logs()
 
@@ -1,5 +1,6 @@
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
 from datetime import datetime
 from typing import Optional
 
@@ -16,6 +17,12 @@ from data_sourcing.geometry_toolkit import GeometryToolkit
 from data_sourcing.sentinelhub_api import SentinelHubAPI
 
 
+def _dump_bytes(path: str, payload: bytes) -> None:
+    """Write a debug payload to disk; runs on the background dump writer."""
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
 class DownloadPipeline:
     """
     Encapsulates sentinel download logic. Instantiate with GeometryToolkit and SentinelHubAPI
@@ -34,6 +41,10 @@ class DownloadPipeline:
             self.config.GEOMETRY_FILE, self.config.GEOMETRY_FILE_CRS
         )
         self.sentinel_api = sentinel_api or SentinelHubAPI()
+        self._tile_layout: tuple | None = None
+        # failed-tile debug dumps go through a single background writer so
+        # a slow disk on the error path never stalls the fetch workers
+        self._debug_writer = ThreadPoolExecutor(max_workers=1)
 
     def run(self) -> np.ndarray:
         self.logger.info(
@@ -47,34 +58,60 @@ class DownloadPipeline:
             start_date=start_date, end_date=end_date
         )
 
-        result = []
-        for ind, start_interval in enumerate(ms_date):
-            data = self.request_and_stack_tiles(
-                evalscript_type=self.config.EVALSCRIPT_TYPE,
-                start_date=start_interval,
-                end_date=me_date[ind],
+        if len(ms_date) == 0:
+            raise ValueError(
+                f"No monthly intervals between {self.config.START_DATE} and {self.config.END_DATE}"
             )
-            result.append(data)
 
-        np.save(get_data_path(cf.OBSERVATION_SAVE_FILE), result)
+        result = None
+        try:
+            for ind, start_interval in enumerate(ms_date):
+                data = self.request_and_stack_tiles(
+                    evalscript_type=self.config.EVALSCRIPT_TYPE,
+                    start_date=start_interval,
+                    end_date=me_date[ind],
+                )
+
+                # allocate the full .npy file once and stream each month into
+                # its slice instead of holding every stack in RAM until the end
+                if result is None:
+                    result = np.lib.format.open_memmap(
+                        get_data_path(cf.OBSERVATION_SAVE_FILE),
+                        mode="w+",
+                        dtype=data.dtype,
+                        shape=(len(ms_date), *data.shape),
+                    )
+                result[ind] = data
+        finally:
+            self._flush_debug_dumps()
+
+        result.flush()
         self.logger.info(
             LogSegment.DATA_DOWNLOAD,
-            f"Download pipeline completed. Saved {len(result)} monthly observations to {cf.OBSERVATION_SAVE_FILE}",
+            f"Download pipeline completed. Saved {len(ms_date)} monthly observations to {cf.OBSERVATION_SAVE_FILE}",
         )
         self.logger._flush_logs()
-        return np.array(result)
+        return result
+
+    def _flush_debug_dumps(self) -> None:
+        """Wait for queued debug dumps, then restore the writer for reuse."""
+        self._debug_writer.shutdown(wait=True)
+        self._debug_writer = ThreadPoolExecutor(max_workers=1)
 
     @staticmethod
     def validate_response_content(response: Response) -> bool:
         logger = Logger.get_instance()
-        logger.info(
+        # per-tile chatter is debug-only: at hundreds of tiles per month the
+        # stdout writes otherwise serialize the worker threads on the print
+        # lock
+        logger.debug(
             LogSegment.DATA_DOWNLOAD, f"Response status: {response.status_code}"
         )
-        logger.info(
+        logger.debug(
             LogSegment.DATA_DOWNLOAD,
             f"Response content type: {response.headers.get('content-type', 'Unknown')}",
         )
-        logger.info(
+        logger.debug(
             LogSegment.DATA_DOWNLOAD,
             f"Response content length: {len(response.content)} bytes",
         )
@@ -102,6 +139,51 @@ class DownloadPipeline:
 
         return True
 
+    def get_tile_layout(
+        self,
+    ) -> tuple[dict[tuple[int, int], tuple[int, int]], list, int, int]:
+        """Tile geometry shared by every monthly interval, computed once.
+
+        The bboxes, pixel sizes and destination offsets only depend on the
+        tiling grid and the AOI, so recomputing them per month just repeats
+        identical geometry and pixel math. The offsets prefix-sum the
+        per-tile pixel sizes so every tile can be written straight into
+        its slice of the stacked month.
+
+        Returns:
+            tuple: (offsets mapping (i, j) -> (y0, x0), list of
+                (i, j, bbox, width_px, height_px) jobs for intersecting
+                tiles, total height in pixels, total width in pixels)
+        """
+        if self._tile_layout is not None:
+            return self._tile_layout
+
+        height, width, coords = np.shape(self.geom_tools.tiles)
+        intersection_mask = self.geom_tools.get_tile_intersection_mask()
+
+        offsets: dict[tuple[int, int], tuple[int, int]] = {}
+        tile_jobs = []
+        y_offset = 0
+        x_total = 0
+        for i in range(height - 2, -1, -1):
+            x_offset = 0
+            row_height_px = 0
+            for j in range(width - 1):
+                bbox = self.geom_tools.get_bbox(i, j)
+                width_px, height_px = self.geom_tools.get_pixels(bbox)
+                offsets[(i, j)] = (y_offset, x_offset)
+                x_offset += width_px
+                row_height_px = height_px
+
+                if intersection_mask[i, j]:
+                    tile_jobs.append((i, j, bbox, width_px, height_px))
+
+            y_offset += row_height_px
+            x_total = x_offset
+
+        self._tile_layout = (offsets, tile_jobs, y_offset, x_total)
+        return self._tile_layout
+
     def request_and_stack_tiles(
         self,
         evalscript_type: EvalScriptType,
@@ -112,134 +194,131 @@ class DownloadPipeline:
             LogSegment.DATA_DOWNLOAD,
             f"Requesting and stacking tiles for {start_date.date()} to {end_date.date()}",
         )
-        height, width, coords = np.shape(self.geom_tools.tiles)
-
-        sentinelhub_api = self.sentinel_api
-
-        tile_data_grid = []
-        bands = None
-
-        for i in range(height - 2, -1, -1):
-            row_tiles = []
-            for j in range(width - 1):
-                bbox = self.geom_tools.get_bbox(i, j)
-                width_px, height_px = self.geom_tools.get_pixels(bbox)
+        offsets, tile_jobs, y_total, x_total = self.get_tile_layout()
+
+        # the month buffer is allocated lazily by whichever worker opens the
+        # first response, since band count and dtype are only known then;
+        # non-intersecting and failed tiles simply stay zero
+        buffer: list[np.ndarray | None] = [None]
+        alloc_lock = Lock()
+
+        def ensure_buffer(bands: int, dtype) -> np.ndarray:
+            with alloc_lock:
+                if buffer[0] is None:
+                    buffer[0] = np.zeros((bands, y_total, x_total), dtype=dtype)
+                return buffer[0]
+
+        # the downloads are almost entirely HTTP wait time, so fetch the tiles
+        # concurrently with a bounded pool to respect Sentinel Hub rate limits
+        with ThreadPoolExecutor(
+            max_workers=self.config.MAX_CONCURRENT_REQUESTS
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.fetch_tile,
+                    i,
+                    j,
+                    bbox,
+                    width_px,
+                    height_px,
+                    evalscript_type,
+                    start_date,
+                    end_date,
+                    offsets[(i, j)],
+                    ensure_buffer,
+                )
+                for i, j, bbox, width_px, height_px in tile_jobs
+            ]
+            for future in as_completed(futures):
+                future.result()
 
-                if not self.geom_tools.bbox_intersects_geometry(bbox):
-                    row_tiles.append(
-                        {"data": None, "width_px": width_px, "height_px": height_px}
-                    )
-                else:
-                    self.json_request = sentinelhub_api.build_json_request(
-                        width_px=width_px,
-                        height_px=height_px,
-                        start_date=start_date,
-                        end_date=end_date,
-                        evalscript_type=evalscript_type,
-                        bbox=list(bbox),
-                        crs="EPSG:3857",
-                    )
+        final_data = buffer[0]
+        if final_data is None:
+            raise ValueError("No valid tiles found in the geometry")
 
-                    self.logger.info(
-                        LogSegment.DATA_DOWNLOAD,
-                        f"Sending request for tile [{i}, {j}] - BBox: {list(bbox)}, Size: {width_px}x{height_px}",
-                    )
+        self.logger._flush_logs()
 
-                    try:
-                        response = sentinelhub_api.safe_send_request()
-
-                        if not self.validate_response_content(response):
-                            self.logger.warning(
-                                LogSegment.DATA_DOWNLOAD,
-                                f"Invalid response for tile [{i}, {j}], filling with zeros",
-                            )
-                            row_tiles.append(
-                                {
-                                    "data": None,
-                                    "width_px": width_px,
-                                    "height_px": height_px,
-                                }
-                            )
-                            continue
-
-                        try:
-                            with MemoryFile(response.content) as memfile:
-                                with memfile.open() as ds:
-                                    tile_data = ds.read()
-                                    self.logger.info(
-                                        LogSegment.DATA_DOWNLOAD,
-                                        f"Successfully read tile [{i}, {j}]: shape {tile_data.shape}",
-                                    )
-
-                                    if bands is None:
-                                        bands = tile_data.shape[0]
-                                        self.logger.info(
-                                            LogSegment.DATA_DOWNLOAD,
-                                            f"Detected {bands} bands",
-                                        )
-
-                                    row_tiles.append(
-                                        {
-                                            "data": tile_data,
-                                            "width_px": width_px,
-                                            "height_px": height_px,
-                                        }
-                                    )
-
-                        except Exception as raster_error:
-                            self.logger.error(
-                                LogSegment.DATA_DOWNLOAD,
-                                f"Failed to read tile [{i}, {j}] as raster: {raster_error}",
-                            )
-                            debug_filename = f"debug_response_tile_{i}_{j}.bin"
-                            with open(debug_filename, "wb") as f:
-                                f.write(response.content)
-                            self.logger.info(
-                                LogSegment.DATA_DOWNLOAD,
-                                f"Saved response content to {debug_filename}",
-                            )
-
-                            row_tiles.append(
-                                {
-                                    "data": None,
-                                    "width_px": width_px,
-                                    "height_px": height_px,
-                                }
-                            )
-
-                    except Exception as request_error:
-                        self.logger.error(
-                            LogSegment.DATA_DOWNLOAD,
-                            f"Request failed for tile [{i}, {j}]: {request_error}",
-                        )
-                        row_tiles.append(
-                            {"data": None, "width_px": width_px, "height_px": height_px}
-                        )
+        return final_data
 
-                time.sleep(1)
+    def fetch_tile(
+        self,
+        i: int,
+        j: int,
+        bbox,
+        width_px: int,
+        height_px: int,
+        evalscript_type: EvalScriptType,
+        start_date: datetime,
+        end_date: datetime,
+        offset: tuple[int, int],
+        ensure_buffer,
+    ) -> bool:
+        """Request a single tile and decode it into the shared month buffer.
+
+        ensure_buffer lazily allocates the (bands, H, W) destination from
+        the band count and dtype of the opened dataset; rasterio then
+        decodes straight into the tile's slice via read(out=...), so no
+        intermediate per-tile array exists. Returns True on success; on
+        failure the slice stays zero-filled.
+        """
+        json_request = self.sentinel_api.build_json_request(
+            width_px=width_px,
+            height_px=height_px,
+            start_date=start_date,
+            end_date=end_date,
+            evalscript_type=evalscript_type,
+            bbox=list(bbox),
+            crs="EPSG:3857",
+        )
 
-            tile_data_grid.append(row_tiles)
+        self.logger.debug(
+            LogSegment.DATA_DOWNLOAD,
+            f"Sending request for tile [{i}, {j}] - BBox: {list(bbox)}, Size: {width_px}x{height_px}",
+        )
 
-        if bands is None:
-            raise ValueError("No valid tiles found in the geometry")
+        try:
+            response = self.sentinel_api.safe_send_request(json_request=json_request)
 
-        stacked_rows = []
-        for row in tile_data_grid:
-            row_data = []
-            for tile_info in row:
-                if tile_info["data"] is None:
-                    zeros_tile = np.zeros(
-                        (bands, tile_info["height_px"], tile_info["width_px"])
-                    )
-                    row_data.append(zeros_tile)
-                else:
-                    row_data.append(tile_info["data"])
+            if not self.validate_response_content(response):
+                self.logger.warning(
+                    LogSegment.DATA_DOWNLOAD,
+                    f"Invalid response for tile [{i}, {j}], filling with zeros",
+                )
+                return False
 
-            stacked_row = np.concatenate(row_data, axis=2)
-            stacked_rows.append(stacked_row)
+            try:
+                with MemoryFile(response.content) as memfile:
+                    with memfile.open() as ds:
+                        out = ensure_buffer(ds.count, ds.dtypes[0])
+                        y0, x0 = offset
+                        ds.read(
+                            out=out[:, y0 : y0 + height_px, x0 : x0 + width_px]
+                        )
 
-        final_data = np.concatenate(stacked_rows, axis=1)
+                self.logger.debug(
+                    LogSegment.DATA_DOWNLOAD,
+                    f"Successfully read tile [{i}, {j}] into slice at {offset}",
+                )
+                return True
 
-        self.logger._flush_logs()
+            except Exception as raster_error:
+                self.logger.error(
+                    LogSegment.DATA_DOWNLOAD,
+                    f"Failed to read tile [{i}, {j}] as raster: {raster_error}",
+                )
+                debug_filename = f"debug_response_tile_{i}_{j}.bin"
+                self._debug_writer.submit(
+                    _dump_bytes, debug_filename, response.content
+                )
+                self.logger.info(
+                    LogSegment.DATA_DOWNLOAD,
+                    f"Saved response content to {debug_filename}",
+                )
+                return False
 
-        return final_data
+        except Exception as request_error:
+            self.logger.error(
+                LogSegment.DATA_DOWNLOAD,
+                f"Request failed for tile [{i}, {j}]: {request_error}",
+            )
+            return False
@@ -56,6 +56,22 @@ def test_non_intersecting_bbox(geometry_toolkit: GeometryToolkit):
     assert geometry_toolkit.bbox_intersects_geometry(bbox_out) is False
 
 
+def test_tile_intersection_mask_matches_per_bbox_checks(
+    geometry_toolkit: GeometryToolkit,
+):
+    tiles = geometry_toolkit.tiles
+    mask = geometry_toolkit.get_tile_intersection_mask()
+
+    # one entry per tile, i.e. one less than the corner grid in each direction
+    assert mask.shape == (tiles.shape[0] - 1, tiles.shape[1] - 1)
+    assert mask.dtype == bool
+
+    for i in range(mask.shape[0]):
+        for j in range(mask.shape[1]):
+            bbox = geometry_toolkit.get_bbox(i, j)
+            assert mask[i, j] == geometry_toolkit.bbox_intersects_geometry(bbox)
+
+
 def test_geometry_bounds_consistent_with_tiles(geometry_toolkit: GeometryToolkit):
     geom_3857 = geometry_toolkit.get_geometry_as_3857()
     gminx, gminy, gmaxx, gmaxy = geom_3857.bounds
@@ -7,7 +7,7 @@ from data_sourcing.sentinelhub_api import SentinelHubAPI
 
 
 def make_response(status_code=200, headers=None, json_data=None, text="", content=b""):
-    resp = Mock(spec=["status_code", "headers", "json", "text", "content"])
+    resp = Mock(spec=["status_code", "headers", "json", "text", "content", "close"])
     resp.status_code = status_code
     resp.headers = headers or {}
     resp.text = text